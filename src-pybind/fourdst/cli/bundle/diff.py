@@ -3,10 +3,10 @@ import typer
 from pathlib import Path
 from rich.console import Console
 from rich.panel import Panel
-from rich.text import Text
 from rich.table import Table
 
 from fourdst.core.bundle import diff_bundle
+from fourdst.cli.common.utils import diff_to_text
 
 console = Console()
 
@@ -40,16 +40,7 @@ def bundle_diff(
     # --- 2. Display Manifest Differences ---
     manifest_diff = results['manifest']['diff']
     if manifest_diff:
-        diff_text = Text()
-        for line in manifest_diff:
-            if line.startswith('+'):
-                diff_text.append(line, style="green")
-            elif line.startswith('-'):
-                diff_text.append(line, style="red")
-            elif line.startswith('^'):
-                diff_text.append(line, style="blue")
-            else:
-                diff_text.append(line)
+        diff_text = diff_to_text(manifest_diff, {'+': "green", '-': "red", '^': "blue"})
         console.print(Panel(diff_text, title="[bold]Manifest Differences[/bold]", border_style="yellow"))
     else:
         console.print(Panel("[green]Manifests are identical.[/green]", title="[bold]Manifest[/bold]", border_style="green"))
@@ -1,7 +1,6 @@
 # fourdst/cli/bundle/fill.py
 
 import typer
-import shutil
 import datetime
 import yaml
 import zipfile
@@ -13,17 +12,13 @@ import subprocess
 import sys
 import traceback
 
-try:
-    import docker
-except ImportError:
-    docker = None # Docker is an optional dependency for the 'fill' command
-
 from rich.console import Console
 from rich.panel import Panel
 
 console = Console()
 
 from fourdst.core.bundle import get_fillable_targets, fill_bundle
+from fourdst.core.build import MAX_PARALLEL_DOCKER_BUILDS
 from fourdst.cli.common.utils import run_command_rich # Keep for progress display if needed
 
 custom_key_bindings = KeyBindings()
@@ -83,14 +78,13 @@ def _(event):
 
     event.app.invalidate()    
 
-def bundle_fill(bundle_path: Path = typer.Argument(..., help="The .fbundle file to fill with new binaries.", exists=True)):
+def bundle_fill(
+    bundle_path: Path = typer.Argument(..., help="The .fbundle file to fill with new binaries.", exists=True),
+    max_docker_jobs: int = typer.Option(MAX_PARALLEL_DOCKER_BUILDS, "--max-docker-jobs", min=1, help="How many Docker builds may run at once.")
+):
     """
     Builds new binaries for the current host or cross-targets from the bundle's source.
     """
-    staging_dir = Path(f"temp_fill_{bundle_path.stem}")
-    if staging_dir.exists():
-        shutil.rmtree(staging_dir)
-    
     console.print(Panel(f"[bold]Filling Bundle:[/bold] {bundle_path.name}", expand=False, border_style="blue"))
 
     # 1. Find available targets and missing binaries using the core function
@@ -172,7 +166,8 @@ def bundle_fill(bundle_path: Path = typer.Argument(..., help="The .fbundle file
         fill_bundle(
             bundle_path,
             targets_to_build,
-            progress_callback=lambda msg: console.print(f"[dim]  {msg}[/dim]")
+            progress_callback=lambda msg: console.print(f"[dim]  {msg}[/dim]"),
+            max_docker_jobs=max_docker_jobs
         )
         console.print("--- Build process finished ---")
         console.print(f"[green]✅ Bundle '{bundle_path.name}' has been filled successfully.[/green]")
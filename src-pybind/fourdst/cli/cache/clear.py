@@ -3,11 +3,7 @@
 import typer
 import shutil
 from fourdst.cli.common.config import CACHE_PATH
-import typer
-
-cache_app = typer.Typer()
 
-@cache_app.command("clear")
 def cache_clear():
     """
     Clears all cached data, including the ABI signature.
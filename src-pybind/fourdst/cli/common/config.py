@@ -7,5 +7,12 @@ from fourdst.core.config import (
     CROSS_FILES_PATH,
     CACHE_PATH,
     ABI_CACHE_FILE,
+    ABI_DETECTOR_BIN_PATH,
+    DOCKER_ABI_CACHE_PATH,
+    BUILD_CACHE_PATH,
+    DOCKER_CCACHE_PATH,
+    CLANG_AST_CACHE_PATH,
+    BUNDLE_ZIP_COMPRESSLEVEL,
+    PRECOMPRESSED_SUFFIXES,
     DOCKER_BUILD_IMAGES
 )
@@ -0,0 +1,36 @@
+# fourdst/cli/common/lazy.py
+
+import importlib
+
+import typer
+from typer.core import TyperGroup
+
+
+class LazyTyperGroup(TyperGroup):
+    """
+    A Typer group whose commands are given as "module:function" strings and only
+    imported when they are invoked or listed in help. This keeps the heavy
+    dependencies of one command (docker, questionary, libclang, ...) out of the
+    startup path of every other command.
+    """
+    lazy_commands: dict[str, str] = {}
+
+    def list_commands(self, ctx):
+        commands = list(super().list_commands(ctx))
+        return commands + [name for name in self.lazy_commands if name not in commands]
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            module_name, function_name = self.lazy_commands[cmd_name].split(":")
+            function = getattr(importlib.import_module(module_name), function_name)
+            # The completion options belong to the top-level app only
+            command_app = typer.Typer(add_completion=False)
+            command_app.command(cmd_name)(function)
+            self.add_command(typer.main.get_command(command_app), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+
+def lazy_typer(commands: dict[str, str], **kwargs) -> typer.Typer:
+    """Creates a Typer app whose commands are imported on first use."""
+    group_cls = type("LazyTyperGroup", (LazyTyperGroup,), {"lazy_commands": commands})
+    return typer.Typer(cls=group_cls, **kwargs)
@@ -3,12 +3,20 @@
 import typer
 import os
 import sys
+import json
+import hashlib
+import functools
+import itertools
 import subprocess
 from pathlib import Path
 import importlib.resources
 
 from rich.console import Console
 from rich.panel import Panel
+from rich.text import Text
+
+from fourdst.core.config import CLANG_AST_CACHE_PATH
+from fourdst.core.utils import read_json, write_json, calculate_sha256
 
 console = Console()
 
@@ -47,8 +55,25 @@ def run_command_rich(command: list[str], cwd: Path = None, check=True, env: dict
 
     return process
 
+def diff_to_text(diff_lines, line_styles: dict[str, str]) -> Text:
+    """
+    Builds a rich Text from diff lines, styled by their first character.
+
+    Consecutive lines with the same style become a single span, so a large diff
+    costs one Text.append per run of added/removed/context lines, not per line.
+    """
+    diff_text = Text()
+    for style, lines in itertools.groupby(diff_lines, key=lambda line: line_styles.get(line[:1])):
+        diff_text.append(''.join(lines), style=style)
+    return diff_text
+
+@functools.lru_cache(maxsize=16)
 def get_template_content(template_name: str) -> str:
-    """Safely reads content from a template file packaged with the CLI."""
+    """
+    Safely reads content from a template file packaged with the CLI.
+
+    Templates ship with the package and never change at runtime, so each is read once per process.
+    """
     try:
         return importlib.resources.files('fourdst.cli.templates').joinpath(template_name).read_text()
     except FileNotFoundError:
@@ -133,18 +158,16 @@ def is_abi_compatible(host_abi: str, binary_abi: str) -> bool:
         # If parsing fails, fall back to a simple string comparison
         return host_abi == binary_abi
 
-def calculate_sha256(file_path: Path) -> str:
-    """Calculates the SHA256 checksum of a file."""
-    sha256_hash = hashlib.sha256()
-    with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
-    return sha256_hash.hexdigest()
+# libclang module and Index, set up once per process
+_cindex = None
+_clang_index = None
+
+def _load_cindex():
+    """Imports libclang's cindex module, making sure the shared library is loaded."""
+    global _cindex
+    if _cindex is not None:
+        return _cindex
 
-def parse_cpp_header(header_path: Path):
-    """
-    Parses a C++ header file using libclang to find classes and their pure virtual methods.
-    """
     # This function requires python-clang-16
     try:
         from clang import cindex
@@ -163,6 +186,122 @@ def parse_cpp_header(header_path: Path):
             print(f"Details: {e}", file=sys.stderr)
             raise typer.Exit(code=1)
 
+    _cindex = cindex
+    return cindex
+
+def get_clang_index(cindex):
+    """
+    Returns the process-wide libclang Index, creating it on first use.
+
+    Reusing one Index avoids allocating (and leaking) a new libclang context for
+    every header parsed in the same process.
+    """
+    global _clang_index
+    if _clang_index is None:
+        _clang_index = cindex.Index.create(excludeDecls=True)
+    return _clang_index
+
+def get_clang_parse_options(cindex) -> int:
+    """
+    libclang options for interface discovery. Only class and method declarations
+    are inspected, so function bodies are skipped and an incomplete TU is acceptable.
+    """
+    return (cindex.TranslationUnit.PARSE_SKIP_FUNCTION_BODIES
+            | cindex.TranslationUnit.PARSE_INCOMPLETE)
+
+def _get_file_stamps(file_paths) -> dict[str, list[int]]:
+    """Maps each file to its [st_mtime_ns, st_size]."""
+    stamps = {}
+    for file_path in file_paths:
+        st = os.stat(file_path)
+        stamps[file_path] = [st.st_mtime_ns, st.st_size]
+    return stamps
+
+def _clang_cache_disabled() -> bool:
+    """The libclang caches can be turned off, e.g. on CI, by setting FOURDST_NO_CLANG_CACHE."""
+    return os.environ.get("FOURDST_NO_CLANG_CACHE", "") not in ("", "0")
+
+def _has_parse_errors(cindex, translation_unit) -> bool:
+    return any(d.severity >= cindex.Diagnostic.Error for d in translation_unit.diagnostics)
+
+def _get_interface_cache_path(header_path: Path, args: list[str], options: int) -> Path:
+    header_path = Path(header_path).resolve()
+    digest = hashlib.sha256(json.dumps([str(header_path), args, options]).encode('utf-8'))
+    digest.update(Path(header_path).read_bytes())
+    return CLANG_AST_CACHE_PATH / f"{digest.hexdigest()[:32]}.interfaces.json"
+
+def load_cached_interfaces(header_path: Path, args: list[str], options: int):
+    """
+    Returns the interfaces an earlier parse found in a header, or None.
+
+    Entries are keyed by the header's content and parse arguments, and are only
+    reused while every header it included is unchanged on disk, so libclang is
+    not needed at all on a hit.
+    """
+    if _clang_cache_disabled():
+        return None
+    try:
+        cached = read_json(_get_interface_cache_path(header_path, args, options))
+        if _get_file_stamps(cached['dependencies']) != cached['dependencies']:
+            return None
+        return cached['interfaces']
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
+
+def store_cached_interfaces(cindex, translation_unit, header_path: Path, args: list[str], options: int, interfaces: dict) -> None:
+    """Saves the interfaces found in a header for load_cached_interfaces."""
+    if _clang_cache_disabled() or _has_parse_errors(cindex, translation_unit):
+        return
+    try:
+        dependencies = sorted({inclusion.include.name for inclusion in translation_unit.get_includes()})
+        CLANG_AST_CACHE_PATH.mkdir(parents=True, exist_ok=True)
+        write_json(_get_interface_cache_path(header_path, args, options),
+                   {'dependencies': _get_file_stamps(dependencies), 'interfaces': interfaces})
+    except OSError:
+        # Caching is best effort; the header is simply parsed again next time
+        pass
+
+def iter_class_definitions(translation_unit, cindex, header_paths: set[Path]):
+    """
+    Yields (header_path, cursor) for each class defined at namespace scope in one of header_paths.
+
+    Only top-level cursors and namespace bodies are visited, so function bodies and
+    declarations coming from other included headers are never descended into.
+    """
+    class_decl = cindex.CursorKind.CLASS_DECL
+    namespace_decl = cindex.CursorKind.NAMESPACE
+    resolved_files = {}
+
+    stack = [translation_unit.cursor.get_children()]
+    while stack:
+        cursor = next(stack[-1], None)
+        if cursor is None:
+            stack.pop()
+            continue
+
+        location_file = cursor.location.file
+        if location_file is None:
+            continue
+        file_name = location_file.name
+        if file_name not in resolved_files:
+            resolved_files[file_name] = Path(file_name).resolve()
+        header_path = resolved_files[file_name]
+        if header_path not in header_paths:
+            continue
+
+        kind = cursor.kind
+        if kind == namespace_decl:
+            stack.append(cursor.get_children())
+        elif kind == class_decl and cursor.is_definition():
+            yield header_path, cursor
+
+def parse_cpp_header(header_path: Path):
+    """
+    Parses a C++ header file using libclang to find classes and their pure virtual methods.
+    """
+    header_path = Path(header_path).resolve()
+    cindex = _load_cindex()
+
     # --- Get compiler flags from pkg-config to help clang find includes ---
     try:
         pkg_config_proc = subprocess.run(
@@ -179,34 +318,43 @@ def parse_cpp_header(header_path: Path):
         print("Please ensure 'pkg-config' is installed and 'fourdst-plugin.pc' is in your PKG_CONFIG_PATH.", file=sys.stderr)
         compiler_flags = []
 
-    index = cindex.Index.create()
     # Add the pkg-config flags to the parser arguments
-    translation_unit = index.parse(str(header_path), args=['-x', 'c++', '-std=c++23'] + compiler_flags)
+    args = ['-x', 'c++', '-std=c++23', '-Wno-everything'] + compiler_flags
+    options = get_clang_parse_options(cindex)
 
-    interfaces = {}
-    for cursor in translation_unit.cursor.walk_preorder():
-        if cursor.kind == cindex.CursorKind.CLASS_DECL and cursor.is_definition():
-            class_name = cursor.spelling
-            methods = []
-            for child in cursor.get_children():
-                if child.kind == cindex.CursorKind.CXX_METHOD and child.is_pure_virtual_method():
-                    method_name = child.spelling
-                    result_type = child.result_type.spelling
-                    # Recreate the full method signature
-                    params = [p.spelling or f"param{i+1}" for i, p in enumerate(child.get_arguments())]
-                    param_str = ", ".join(f"{p.type.spelling} {p.spelling}" for p in child.get_arguments())
-                    const_qualifier = " const" if child.is_const_method() else ""
-
-                    signature = f"{result_type} {method_name}({param_str}){const_qualifier}"
-
-                    # Generate a placeholder body
-                    body = f"    // TODO: Implement the {method_name} method.\n"
-                    if result_type != "void":
-                        body += f"    return {{}};" # Default return
-
-                    methods.append({'signature': signature, 'body': body})
-
-            if methods: # Only consider classes with pure virtual methods as interfaces
-                interfaces[class_name] = methods
+    interfaces = load_cached_interfaces(header_path, args, options)
+    if interfaces is not None:
+        return interfaces
 
+    translation_unit = get_clang_index(cindex).parse(str(header_path), args=args, options=options)
+
+    interfaces = {}
+    cxx_method = cindex.CursorKind.CXX_METHOD
+    for _, cursor in iter_class_definitions(translation_unit, cindex, {header_path}):
+        class_name = cursor.spelling
+        methods = []
+        for child in cursor.get_children():
+            if child.kind == cxx_method and child.is_pure_virtual_method():
+                method_name = child.spelling
+                result_type = child.result_type.spelling
+                # Recreate the full method signature, naming any unnamed parameters
+                param_str = ", ".join(
+                    f"{p.type.spelling} {p.spelling or f'param{i+1}'}"
+                    for i, p in enumerate(child.get_arguments())
+                )
+                const_qualifier = " const" if child.is_const_method() else ""
+
+                signature = f"{result_type} {method_name}({param_str}){const_qualifier}"
+
+                # Generate a placeholder body
+                body = f"    // TODO: Implement the {method_name} method.\n"
+                if result_type != "void":
+                    body += f"    return {{}};" # Default return
+
+                methods.append({'signature': signature, 'body': body})
+
+        if methods: # Only consider classes with pure virtual methods as interfaces
+            interfaces[class_name] = methods
+
+    store_cached_interfaces(cindex, translation_unit, header_path, args, options, interfaces)
     return interfaces
@@ -4,9 +4,6 @@ import typer
 from pathlib import Path
 from fourdst.core.keys import generate_key
 
-keys_app = typer.Typer()
-
-@keys_app.command("generate")
 def keys_generate(
     key_name: str = typer.Option("author_key", "--name", "-n", help="The base name for the generated key files."),
     key_type: str = typer.Option("ed25519", "--type", "-t", help="Type of key to generate (ed25519|rsa).", case_sensitive=False),
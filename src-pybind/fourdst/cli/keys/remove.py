@@ -1,17 +1,17 @@
 # fourdst/cli/keys/remove.py
 import typer
-import questionary
 from pathlib import Path
 
 from fourdst.core.keys import remove_key, list_keys
 
 def keys_remove(
-    key_path: Path = typer.Argument(None, help="Path to the public key file to remove.", exists=True, readable=True)
+    key_path: Path = typer.Argument(None, help="Path to the public key file to remove.", exists=True, readable=True),
+    remove_all: bool = typer.Option(False, "--all", help="Remove every copy of the key instead of only the first match.")
 ):
     """Removes a single public key from the local trust store."""
     if key_path:
         # Remove by path
-        result = remove_key(str(key_path))
+        result = remove_key(str(key_path), remove_all=remove_all)
         
         if result["success"]:
             for removed_key in result["removed_keys"]:
@@ -20,6 +20,8 @@ def keys_remove(
             typer.secho(f"Error: {result['error']}", fg=typer.colors.YELLOW)
     else:
         # Interactive removal
+        import questionary
+
         keys_result = list_keys()
         
         if not keys_result["success"]:
@@ -35,7 +37,8 @@ def keys_remove(
         for source_name, keys in keys_result["keys"].items():
             for key_info in keys:
                 relative_path = f"{source_name}/{key_info['name']}"
-                choice_name = f"{relative_path} ({key_info['fingerprint']})"
+                # The full fingerprint is the identifier; a 16 hex digit prefix is enough to tell keys apart
+                choice_name = f"{relative_path} ({key_info['fingerprint'][:len('sha256:') + 16]})"
                 choices.append({
                     "name": choice_name,
                     "value": key_info['fingerprint']  # Use fingerprint as identifier
@@ -1,12 +1,8 @@
 # fourdst/cli/keys/sync.py
 import typer
-import questionary
 
 from fourdst.core.keys import sync_remotes, remove_remote_source
 
-keys_app = typer.Typer()
-
-@keys_app.command("sync")
 def keys_sync():
     """
     Syncs the local trust store with all configured remote Git repositories.
@@ -42,6 +38,8 @@ def keys_sync():
     
     # Ask about failed remotes that weren't automatically removed
     failed_remotes = [r for r in result["synced_remotes"] if r["status"] == "failed" and r["name"] not in result["removed_remotes"]]
+    if failed_remotes:
+        import questionary
     for remote_info in failed_remotes:
         if questionary.confirm(f"Do you want to remove the failing remote '{remote_info['name']}'?").ask():
             remove_result = remove_remote_source(remote_info['name'])
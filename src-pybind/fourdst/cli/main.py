@@ -1,98 +1,104 @@
 # fourdst/cli/main.py
 
-import typer
-from pathlib import Path
+import sys
 
 from fourdst.cli.common.config import CACHE_PATH
 
-from fourdst.cli.bundle.create import bundle_create
-from fourdst.cli.bundle.fill import bundle_fill
-from fourdst.cli.bundle.sign import bundle_sign
-from fourdst.cli.bundle.inspect import bundle_inspect
-from fourdst.cli.bundle.clear import bundle_clear
-from fourdst.cli.bundle.diff import bundle_diff
-from fourdst.cli.bundle.validate import bundle_validate
-
-from fourdst.cli.plugin.init import plugin_init
-from fourdst.cli.plugin.pack import plugin_pack
-from fourdst.cli.plugin.extract import plugin_extract
-from fourdst.cli.plugin.diff import plugin_diff
-from fourdst.cli.plugin.validate import plugin_validate
-
-from fourdst.cli.cache.clear import cache_clear
-
-from fourdst.cli.keys.generate import keys_generate
-from fourdst.cli.keys.sync import keys_sync
-from fourdst.cli.keys.add import keys_add
-from fourdst.cli.keys.remove import keys_remove
-from fourdst.cli.keys.list import keys_list
-
-from fourdst.cli.keys.remote.add import remote_add
-from fourdst.cli.keys.remote.list import remote_list
-from fourdst.cli.keys.remote.remove import remote_remove
-
-
-app = typer.Typer(
-    name="fourdst-cli",
-    help="A command-line tool for managing fourdst projects, plugins, and bundles."
-)
-
-plugin_app = typer.Typer(name="plugin", help="Commands for managing individual fourdst plugins.")
-bundle_app = typer.Typer(name="bundle", help="Commands for creating, signing, and managing plugin bundles.")
-
-bundle_app.command("create")(bundle_create)
-bundle_app.command("fill")(bundle_fill)
-bundle_app.command("sign")(bundle_sign)
-bundle_app.command("inspect")(bundle_inspect)
-bundle_app.command("clear")(bundle_clear)
-bundle_app.command("diff")(bundle_diff)
-bundle_app.command("validate")(bundle_validate)
-cache_app = typer.Typer(name="cache", help="Commands for managing the local cache.")
-
-keys_app = typer.Typer(name="keys", help="Commands for cryptographic key generation and management.")
-remote_app = typer.Typer(name="remote", help="Manage remote git repositories for public keys.")
-
-# Add commands to their respective apps
-plugin_app.command("init")(plugin_init)
-plugin_app.command("pack")(plugin_pack)
-plugin_app.command("extract")(plugin_extract)
-plugin_app.command("validate")(plugin_validate)
-plugin_app.command("diff")(plugin_diff)
-
-bundle_app.command("create")(bundle_create)
-bundle_app.command("fill")(bundle_fill)
-bundle_app.command("sign")(bundle_sign)
-bundle_app.command("inspect")(bundle_inspect)
-bundle_app.command("clear")(bundle_clear)
-bundle_app.command("diff")(bundle_diff)
-bundle_app.command("validate")(bundle_validate)
-
-cache_app.command("clear")(cache_clear)
-
-
-keys_app.add_typer(remote_app)
-
-keys_app.command("generate")(keys_generate)
-keys_app.command("sync")(keys_sync)
-keys_app.command("add")(keys_add)
-keys_app.command("remove")(keys_remove)
-keys_app.command("list")(keys_list)
-
-remote_app.command("add")(remote_add)
-remote_app.command("list")(remote_list)
-remote_app.command("remove")(remote_remove)
-
-
-# Add the sub-apps to the main app
-app.add_typer(plugin_app, name="plugin")
-app.add_typer(bundle_app, name="bundle")
-app.add_typer(keys_app, name="keys")
-app.add_typer(cache_app, name="cache")
+
+VERSION_FLAGS = ("--version", "-v")
+
+# Sub-apps of the CLI, in help order: name -> (help, {command: "module:function"})
+SUB_APPS = {
+    "plugin": ("Commands for managing individual fourdst plugins.", {
+        "init": "fourdst.cli.plugin.init:plugin_init",
+        "pack": "fourdst.cli.plugin.pack:plugin_pack",
+        "extract": "fourdst.cli.plugin.extract:plugin_extract",
+        "validate": "fourdst.cli.plugin.validate:plugin_validate",
+        "diff": "fourdst.cli.plugin.diff:plugin_diff",
+    }),
+    "bundle": ("Commands for creating, signing, and managing plugin bundles.", {
+        "create": "fourdst.cli.bundle.create:bundle_create",
+        "fill": "fourdst.cli.bundle.fill:bundle_fill",
+        "sign": "fourdst.cli.bundle.sign:bundle_sign",
+        "inspect": "fourdst.cli.bundle.inspect:bundle_inspect",
+        "clear": "fourdst.cli.bundle.clear:bundle_clear",
+        "diff": "fourdst.cli.bundle.diff:bundle_diff",
+        "validate": "fourdst.cli.bundle.validate:bundle_validate",
+    }),
+    "keys": ("Commands for cryptographic key generation and management.", {
+        "generate": "fourdst.cli.keys.generate:keys_generate",
+        "sync": "fourdst.cli.keys.sync:keys_sync",
+        "add": "fourdst.cli.keys.add:keys_add",
+        "remove": "fourdst.cli.keys.remove:keys_remove",
+        "list": "fourdst.cli.keys.list:keys_list",
+    }),
+    "cache": ("Commands for managing the local cache.", {
+        "clear": "fourdst.cli.cache.clear:cache_clear",
+    }),
+}
+
+# Nested below the keys sub-app
+REMOTE_APP = ("Manage remote git repositories for public keys.", {
+    "add": "fourdst.cli.keys.remote.add:remote_add",
+    "list": "fourdst.cli.keys.remote.list:remote_list",
+    "remove": "fourdst.cli.keys.remote.remove:remote_remove",
+})
+
+
+def _print_version():
+    from fourdst import __version__
+    print(f"fourdst-cli {__version__}")
+
+
+def _version_callback(value: bool):
+    if value:
+        import typer
+        _print_version()
+        raise typer.Exit()
+
+
+def _build_app(command_name: str = None):
+    """
+    Builds the Typer app. When command_name is one of SUB_APPS, only that sub-app is
+    registered, since no other one can be reached from this invocation.
+    """
+    import typer
+    from fourdst.cli.common.lazy import lazy_typer
+
+    app = typer.Typer(
+        name="fourdst-cli",
+        help="A command-line tool for managing fourdst projects, plugins, and bundles."
+    )
+
+    @app.callback()
+    def _main_options(
+        version: bool = typer.Option(False, *VERSION_FLAGS, help="Show the fourdst version and exit.", callback=_version_callback, is_eager=True)
+    ):
+        pass
+
+    # Add the sub-apps to the main app
+    for name in [command_name] if command_name in SUB_APPS else SUB_APPS:
+        help_text, commands = SUB_APPS[name]
+        sub_app = lazy_typer(commands, name=name, help=help_text)
+        if name == "keys":
+            remote_help, remote_commands = REMOTE_APP
+            sub_app.add_typer(lazy_typer(remote_commands, name="remote", help=remote_help))
+        app.add_typer(sub_app, name=name)
+    return app
+
 
 def main():
+    # Answer a bare --version without importing Typer or building the command tree
+    if len(sys.argv) == 2 and sys.argv[1] in VERSION_FLAGS:
+        _print_version()
+        return
+
     # Create config directory if it doesn't exist
     CACHE_PATH.mkdir(parents=True, exist_ok=True)
-    app()
+
+    # The top-level options take no values, so the first other argument is the sub-app
+    command_name = next((arg for arg in sys.argv[1:] if not arg.startswith("-")), None)
+    _build_app(command_name)()
 
 if __name__ == "__main__":
     main()
@@ -3,9 +3,9 @@ import typer
 from pathlib import Path
 from rich.console import Console
 from rich.panel import Panel
-from rich.text import Text
 
 from fourdst.core.plugin import compare_plugin_sources
+from fourdst.cli.common.utils import diff_to_text
 
 console = Console()
 
@@ -42,15 +42,8 @@ def plugin_diff(
         file_path = modified_file['file_path']
         diff_content = modified_file['diff']
         
-        diff_text = Text()
-        for line in diff_content.splitlines(keepends=True):
-            if line.startswith('+'): 
-                diff_text.append(line, style="green")
-            elif line.startswith('-'): 
-                diff_text.append(line, style="red")
-            else: 
-                diff_text.append(line)
-        
+        diff_text = diff_to_text(diff_content.splitlines(keepends=True), {'+': "green", '-': "red"})
+
         console.print(Panel(diff_text, title=f"[bold yellow]Modified: {file_path}[/bold yellow]", border_style="yellow", expand=False))
 
     if not has_changes:
@@ -7,15 +7,13 @@ import questionary
 
 from fourdst.core.plugin import parse_cpp_interface, generate_plugin_project
 
-plugin_app = typer.Typer()
-
-@plugin_app.command("init")
 def plugin_init(
         project_name: str = typer.Argument(..., help="The name of the new plugin project."),
         header: Path = typer.Option(..., "--header", "-H", help="Path to the C++ header file defining the plugin interface.", exists=True, file_okay=True, dir_okay=False, readable=True),
         directory: Path = typer.Option(".", "-d", "--directory", help="The directory to create the project in.", resolve_path=True),
         version: str = typer.Option("0.1.0", "--ver", help="The initial SemVer version of the plugin."),
-        libplugin_rev: str = typer.Option("main", "--libplugin-rev", help="The git revision of libplugin to use.")
+        libplugin_rev: str = typer.Option("main", "--libplugin-rev", help="The git revision of libplugin to use."),
+        interface: str = typer.Option(None, "--interface", "-i", help="The interface to implement. Skips the prompt, e.g. for scripted use.")
 ):
     """
     Initializes a new Meson-based C++ plugin project from an interface header.
@@ -39,11 +37,19 @@ def plugin_init(
         for method in methods:
             print(f"  -> Found pure virtual method: {method['signature']}")
 
-    # Interactive Selection
-    chosen_interface = questionary.select(
-        "Which interface would you like to implement?",
-        choices=list(interfaces.keys())
-    ).ask()
+    # Interactive Selection, unless there is nothing to choose
+    if interface:
+        if interface not in interfaces:
+            print(f"Error: Interface '{interface}' not found in {header}. Found: {', '.join(interfaces)}", file=sys.stderr)
+            raise typer.Exit(code=1)
+        chosen_interface = interface
+    elif len(interfaces) == 1:
+        chosen_interface = next(iter(interfaces))
+    else:
+        chosen_interface = questionary.select(
+            "Which interface would you like to implement?",
+            choices=list(interfaces.keys())
+        ).ask()
 
     if not chosen_interface:
         raise typer.Exit() # User cancelled
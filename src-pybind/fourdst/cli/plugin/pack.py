@@ -7,7 +7,8 @@ from fourdst.core.plugin import validate_bundle_directory, pack_bundle_directory
 
 def plugin_pack(
     folder_path: Path = typer.Argument(..., help="The directory to pack into a bundle.", exists=True, file_okay=False, dir_okay=True, readable=True),
-    name: str = typer.Option(None, "--name", "-n", help="The name for the output bundle file (without extension). Defaults to the folder name.")
+    name: str = typer.Option(None, "--name", "-n", help="The name for the output bundle file (without extension). Defaults to the folder name."),
+    include_unreferenced: bool = typer.Option(False, "--include-unreferenced", help="Also pack files in the directory that the manifest does not reference.")
 ):
     """
     Validates and packs a directory into a .fbundle archive.
@@ -37,10 +38,11 @@ def plugin_pack(
     # Pack using core function
     output_config = {
         'name': output_name,
-        'output_dir': folder_path.parent
+        'output_dir': folder_path.parent,
+        'include_unreferenced': include_unreferenced
     }
     
-    pack_result = pack_bundle_directory(folder_path, output_config)
+    pack_result = pack_bundle_directory(folder_path, output_config, validation_result)
     if not pack_result['success']:
         typer.secho(f"An unexpected error occurred during packing: {pack_result['error']}", fg=typer.colors.RED)
         raise typer.Exit(code=1)
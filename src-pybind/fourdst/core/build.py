@@ -1,31 +1,129 @@
 # fourdst/core/build.py
 
 import os
+import sys
+import json
+import codecs
+import shutil
+import hashlib
 import subprocess
 import zipfile
+import zlib
 import io
+import shlex
 import tarfile
+import tempfile
+import time
+import threading
+import copy
 from pathlib import Path
 
-try:
-    import docker
-except ImportError:
-    docker = None
-
-from fourdst.core.utils import run_command
+from fourdst.core.utils import run_command, read_json, write_json, calculate_sha256, extract_zip
 from fourdst.core.platform import get_platform_identifier, get_macos_targeted_platform_identifier
-from fourdst.core.config import CROSS_FILES_PATH, DOCKER_BUILD_IMAGES
+from fourdst.core.config import CROSS_FILES_PATH, DOCKER_BUILD_IMAGES, DOCKER_ABI_CACHE_PATH, BUILD_CACHE_PATH, DOCKER_CCACHE_PATH
+
+# The docker SDK pulls in requests/urllib3, so it is only imported once a Docker target is needed
+_docker = None
+
+# Prefix of container output lines in progress messages
+DOCKER_LOG_PREFIX = "    [docker] "
+
+# Where the host's ccache directory is mounted in build containers
+CONTAINER_CCACHE_DIR = "/ccache"
+
+# File in the container's build directory that the build script writes the built library's path to
+CONTAINER_LIB_PATH_FILE = ".fourdst_lib_path"
+
+# Whether Docker builds bind-mount the extracted sources, which keeps the meson build directory
+# between builds. Elsewhere the daemon runs in a VM, where bind mounts of many small files are
+# slow, so the sdist is copied into the container instead and each build starts from scratch.
+DOCKER_BIND_MOUNT_SOURCES = sys.platform.startswith("linux")
+
+# Python whose meson/ninja builds use in the manylinux images
+DOCKER_PYTHON_BIN = "/opt/python/cp313-cp313/bin"
+
+# Build dependencies installed on top of the manylinux images
+DOCKER_BUILD_DEPENDENCY_COMMANDS = [
+    "dnf install -y openssl-devel",
+    'dnf install -y ccache || echo "ccache is not available in this image, building without it"',
+    "pip install meson ninja cmake",
+]
+
+# Plugin builds that may run at once. meson compile already uses every core, so running
+# a few builds side by side only fills the gaps left by configure/link steps.
+MAX_PARALLEL_BUILDS = max(1, (os.cpu_count() or 1) // 4)
+
+# Docker builds that may run at once, on top of the native/cross ones. Their compilers
+# run in the daemon, which slows down when given many containers at a time.
+MAX_PARALLEL_DOCKER_BUILDS = 2
+
+def _get_docker():
+    """Imports the optional docker module on first use. Returns None if it is not installed."""
+    global _docker
+    if _docker is None:
+        try:
+            import docker
+        except ImportError:
+            return None
+        _docker = docker
+    return _docker
+
+# Docker client shared by all builds; _docker_client_checked also remembers an unreachable daemon
+_docker_client = None
+_docker_client_checked = False
+
+def _get_docker_client():
+    """
+    Connects to the Docker daemon on first use and pings it once per process.
+    Returns None if the docker module is missing or the daemon is not reachable.
+    """
+    global _docker_client, _docker_client_checked
+    if not _docker_client_checked:
+        _docker_client_checked = True
+        docker = _get_docker()
+        if docker is not None:
+            try:
+                client = docker.from_env()
+                client.ping()
+                _docker_client = client
+            except Exception:
+                _docker_client = None
+    return _docker_client
+
+# Seconds a get_available_build_targets result is reused for while the cross files and
+# Docker images stay the same
+BUILD_TARGETS_CACHE_TTL = 30
+
+# (key, timestamp, targets, warning) of the last get_available_build_targets call
+_build_targets_cache = None
 
 def get_available_build_targets(progress_callback=None):
-    """Gets native, cross-compilation, and Docker build targets."""
+    """
+    Gets native, cross-compilation, and Docker build targets.
+
+    The result is cached for BUILD_TARGETS_CACHE_TTL seconds, keyed on the cross file
+    directory and DOCKER_BUILD_IMAGES. Call get_available_build_targets.invalidate()
+    after changing the targets within that time.
+    """
+    global _build_targets_cache
     def report_progress(message):
         if progress_callback:
             progress_callback(message)
 
+    CROSS_FILES_PATH.mkdir(exist_ok=True)
+    cross_dir_stat = CROSS_FILES_PATH.stat()
+    key = (cross_dir_stat.st_mtime_ns, tuple(DOCKER_BUILD_IMAGES.items()))
+    if _build_targets_cache is not None:
+        cached_key, timestamp, targets, warning = _build_targets_cache
+        if cached_key == key and time.monotonic() - timestamp < BUILD_TARGETS_CACHE_TTL:
+            if warning:
+                report_progress(warning)
+            return copy.deepcopy(targets)
+
     targets = [get_platform_identifier()]
-    
+    warning = None
+
     # Add cross-file targets
-    CROSS_FILES_PATH.mkdir(exist_ok=True)
     for cross_file in CROSS_FILES_PATH.glob("*.cross"):
         triplet = cross_file.stem
         targets.append({
@@ -38,88 +136,430 @@ def get_available_build_targets(progress_callback=None):
         })
         
     # Add Docker targets if Docker is available
-    if docker:
+    if _get_docker_client() is not None:
+        targets.extend([
+            {
+                "triplet": f"{name.split(' ')[0]}-linux",
+                "abi_signature": f"docker-{image}",
+                "is_native": False,
+                "cross_file": None,
+                "docker_image": image,
+                "arch": name.split(' ')[0],
+                'type': 'docker'
+            }
+            for name, image in DOCKER_BUILD_IMAGES.items()
+        ])
+    elif _get_docker() is not None:
+        warning = "Warning: Docker is installed but the daemon is not running. Docker targets are unavailable."
+        report_progress(warning)
+
+    _build_targets_cache = (key, time.monotonic(), targets, warning)
+    return copy.deepcopy(targets)
+
+def _invalidate_build_targets():
+    """Drops the cached get_available_build_targets result."""
+    global _build_targets_cache
+    _build_targets_cache = None
+
+get_available_build_targets.invalidate = _invalidate_build_targets
+
+def configure_meson_build_dir(source_dir: Path, build_dir_name: str, setup_args: list[str], stamp: dict, env: dict = None, progress_callback=None):
+    """
+    Runs `meson setup` for source_dir/build_dir_name unless it is already configured
+    with the same settings.
+
+    The stamp describes everything meson only picks up at configure time (setup
+    arguments, compiler flags from the environment, ...). A build directory whose
+    stamp matches is reused as is; `meson compile` regenerates it by itself when
+    meson.build changes, and ninja only rebuilds what changed. Otherwise the
+    directory is wiped and configured from scratch.
+    """
+    build_dir = source_dir / build_dir_name
+    stamp_file = build_dir / ".fourdst_build_stamp"
+    stamp_content = json.dumps(stamp, sort_keys=True)
+
+    if (build_dir / "build.ninja").exists() and stamp_file.exists() and stamp_file.read_text() == stamp_content:
+        if progress_callback:
+            progress_callback(f"Reusing configured build directory {build_dir}")
+        return
+
+    if build_dir.exists():
+        shutil.rmtree(build_dir)
+    run_command(["meson", "setup"] + setup_args + [build_dir_name], cwd=source_dir, env=env, progress_callback=progress_callback, stream=True)
+    stamp_file.write_text(stamp_content)
+
+def get_target_build_dir(plugin_name: str, target: dict) -> Path:
+    """Returns the persistent build directory used for a plugin and native/cross target."""
+    target_key = json.dumps([target.get("triplet"), target.get("abi_signature"), target.get("cross_file")])
+    return BUILD_CACHE_PATH / f"{plugin_name}-{hashlib.sha256(target_key.encode('utf-8')).hexdigest()[:16]}"
+
+SHARED_LIBRARY_SUFFIXES = (".so", ".dylib")
+
+def find_shared_library(build_dir: Path, recursive: bool = False) -> Path | None:
+    """
+    Returns the first lib*.so / lib*.dylib in build_dir (and its subdirectories if
+    recursive), found in a single pass over the directory entries.
+    """
+    pending_dirs = [build_dir]
+    while pending_dirs:
+        with os.scandir(pending_dirs.pop()) as it:
+            for entry in it:
+                if entry.name.startswith("lib") and entry.name.endswith(SHARED_LIBRARY_SUFFIXES) and entry.is_file():
+                    return Path(entry.path)
+                if recursive and entry.is_dir(follow_symlinks=False):
+                    pending_dirs.append(entry.path)
+    return None
+
+def _file_crc32(file_path: Path) -> int:
+    """Computes the CRC-32 of a file, as stored for each member of a zip archive."""
+    crc = 0
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            crc = zlib.crc32(block, crc)
+    return crc
+
+def _sdist_member_path(source_dir: Path, name: str) -> Path | None:
+    """
+    Returns where an sdist member lives below source_dir, or None for names that are
+    absolute, contain '..' parts, or would otherwise resolve outside of source_dir.
+    """
+    normalized = name.replace("\\", "/")
+    parts = normalized.split("/")
+    if normalized.startswith("/") or ".." in parts or ":" in parts[0]:
+        return None
+    path = source_dir.joinpath(*[part for part in parts if part not in ("", ".")])
+    if not path.resolve().is_relative_to(source_dir.resolve()):
+        return None
+    return path
+
+def _sync_sdist_sources(sdist_path: Path, source_dir: Path, state_file: Path, report_progress):
+    """
+    Brings source_dir in line with the contents of an sdist.
+
+    The first extraction unpacks everything. Afterwards, an sdist with the same
+    checksum is not touched at all, and a changed one only rewrites the members
+    whose size or CRC differ and removes files that are no longer in it. Unchanged
+    files keep their mtime, so ninja does not rebuild them, and files created by the
+    build itself (e.g. downloaded subprojects) are left alone.
+    """
+    sdist_checksum = calculate_sha256(sdist_path)
+    previous_state = None
+    if source_dir.exists() and state_file.exists():
         try:
-            client = docker.from_env()
-            client.ping()
-            for name, image in DOCKER_BUILD_IMAGES.items():
-                arch = name.split(' ')[0]
-                targets.append({
-                    "triplet": f"{arch}-linux",
-                    "abi_signature": f"docker-{image}",
-                    "is_native": False,
-                    "cross_file": None,
-                    "docker_image": image,
-                    "arch": arch,
-                    'type': 'docker'
-                })
-        except Exception:
-            report_progress("Warning: Docker is installed but the daemon is not running. Docker targets are unavailable.")
-            
-    return targets
+            previous_state = read_json(state_file)
+        except (OSError, ValueError):
+            previous_state = None
+
+    if previous_state is not None and previous_state.get("checksum") == sdist_checksum:
+        report_progress("Sources unchanged, reusing previous build...")
+        return
+
+    with zipfile.ZipFile(sdist_path, 'r') as sdist_zip:
+        # Bundles come from third parties, so members that would land outside of source_dir are ignored
+        members = [info for info in sdist_zip.infolist()
+                   if not info.is_dir() and _sdist_member_path(source_dir, info.filename) is not None]
+        if previous_state is None:
+            if source_dir.exists():
+                shutil.rmtree(source_dir)
+            extract_zip(sdist_path, source_dir)
+        else:
+            updated = 0
+            for info in members:
+                existing = _sdist_member_path(source_dir, info.filename)
+                if existing.is_file() and existing.stat().st_size == info.file_size and _file_crc32(existing) == info.CRC:
+                    continue
+                sdist_zip.extract(info, source_dir)
+                updated += 1
+            member_names = {info.filename for info in members}
+            stale_files = [_sdist_member_path(source_dir, name) for name in previous_state.get("files", [])
+                           if name not in member_names]
+            stale_files = [path for path in stale_files if path is not None]
+            for path in stale_files:
+                path.unlink(missing_ok=True)
+            report_progress(f"Sources changed: {updated} file(s) updated, {len(stale_files)} removed.")
+
+    write_json(state_file, {"checksum": sdist_checksum, "files": [info.filename for info in members]})
 
 def build_plugin_for_target(sdist_path: Path, build_dir: Path, target: dict, progress_callback=None):
-    """Builds a plugin natively or with a cross file."""
+    """
+    Builds a plugin natively or with a cross file.
+
+    build_dir may be reused between calls (see get_target_build_dir): only the
+    sources that changed in the sdist are rewritten, and an unchanged configuration
+    skips `meson setup` so repeated builds are incremental.
+    """
     def report_progress(message):
         if progress_callback:
             progress_callback(message)
 
     source_dir = build_dir / "src"
-    if source_dir.exists():
-        shutil.rmtree(source_dir)
-    
-    with zipfile.ZipFile(sdist_path, 'r') as sdist_zip:
-        sdist_zip.extractall(source_dir)
-        
-    setup_cmd = ["meson", "setup"]
+    _sync_sdist_sources(sdist_path, source_dir, build_dir / ".sdist_state.json", report_progress)
+
+    setup_args = []
     if target.get("cross_file"):
-        setup_cmd.extend(["--cross-file", target["cross_file"]])
-    setup_cmd.append("build")
-    
-    run_command(setup_cmd, cwd=source_dir, progress_callback=progress_callback)
-    run_command(["meson", "compile", "-C", "build"], cwd=source_dir, progress_callback=progress_callback)
+        setup_args.extend(["--cross-file", target["cross_file"]])
+    stamp = {
+        "setup_args": setup_args,
+        "cross_file_checksum": calculate_sha256(target["cross_file"]) if target.get("cross_file") else None
+    }
+
+    configure_meson_build_dir(source_dir, "build", setup_args, stamp, progress_callback=progress_callback)
+    run_command(["meson", "compile", "-C", "build"], cwd=source_dir, progress_callback=progress_callback, stream=True)
     
     meson_build_dir = source_dir / "build"
-    compiled_lib = next(meson_build_dir.rglob("lib*.so"), None) or next(meson_build_dir.rglob("lib*.dylib"), None)
+    compiled_lib = find_shared_library(meson_build_dir, recursive=True)
     if not compiled_lib:
         raise FileNotFoundError("Could not find compiled library after build.")
         
     return compiled_lib, target
 
+def _get_docker_image(client, image_name: str, report_progress):
+    """
+    Returns a build image, pulling it only if it is not available locally yet.
+    A present image is used as is, without asking the registry for a newer one.
+    """
+    try:
+        return client.images.get(image_name)
+    except _get_docker().errors.ImageNotFound:
+        report_progress(f"  - Pulling Docker image '{image_name}'...")
+        return client.images.pull(image_name)
+
+# Build images resolved by _get_docker_build_image in this process, and a lock per image name
+# so that parallel builds for the same target pull or build it only once
+_docker_build_images = {}
+_docker_build_image_locks = {}
+_docker_build_image_locks_lock = threading.Lock()
+
+def _get_docker_build_image(client, image_name: str, report_progress):
+    """
+    Returns _resolve_docker_build_image(client, image_name, report_progress), resolving
+    each image only once per process.
+    """
+    with _docker_build_image_locks_lock:
+        image_lock = _docker_build_image_locks.setdefault(image_name, threading.Lock())
+    with image_lock:
+        if image_name not in _docker_build_images:
+            _docker_build_images[image_name] = _resolve_docker_build_image(client, image_name, report_progress)
+        return _docker_build_images[image_name]
+
+def _resolve_docker_build_image(client, image_name: str, report_progress):
+    """
+    Returns (image, has_dependencies): an image derived from image_name with
+    DOCKER_BUILD_DEPENDENCY_COMMANDS already run, built locally the first time, or
+    the base image itself if that build fails.
+
+    The tag covers the base image ID and the commands, so the derived image is
+    rebuilt once either changes instead of installing the dependencies in every
+    build container.
+    """
+    docker = _get_docker()
+    base_image = _get_docker_image(client, image_name, report_progress)
+    dependencies_key = json.dumps([base_image.id, DOCKER_BUILD_DEPENDENCY_COMMANDS])
+    tag = f"fourdst-build:{hashlib.sha256(dependencies_key.encode('utf-8')).hexdigest()[:16]}"
+    try:
+        return client.images.get(tag), True
+    except docker.errors.ImageNotFound:
+        pass
+
+    report_progress(f"  - Building image with the build dependencies for '{image_name}' (only needed once)...")
+    dockerfile = (
+        f"FROM {image_name}\n"
+        f'ENV PATH="{DOCKER_PYTHON_BIN}:$PATH"\n'
+        f"RUN set -e; {'; '.join(DOCKER_BUILD_DEPENDENCY_COMMANDS)}\n"
+    )
+    try:
+        image, _ = client.images.build(fileobj=io.BytesIO(dockerfile.encode('utf-8')), tag=tag, pull=False, rm=True)
+        return image, True
+    except (docker.errors.BuildError, docker.errors.APIError) as e:
+        report_progress(f"  - Could not build the image ({e}); installing the dependencies in the build container instead.")
+        return base_image, False
+
+def _docker_abi_cache_file(image_id: str) -> Path:
+    """
+    Returns the cache file for the ABI details of a Docker image, keyed on the image ID
+    and detector source. A re-pulled tag or rebuilt image with another toolchain gets a
+    new ID, so its ABI is detected again.
+    """
+    from fourdst.core.platform import ABI_DETECTOR_CPP_SRC
+    cache_key = hashlib.sha256((image_id + ABI_DETECTOR_CPP_SRC).encode('utf-8')).hexdigest()
+    return DOCKER_ABI_CACHE_PATH / f"{cache_key}.json"
+
+def _load_docker_abi_details(image_id: str) -> dict | None:
+    """Loads previously detected ABI details for a Docker image, if available."""
+    cache_file = _docker_abi_cache_file(image_id)
+    if not cache_file.exists():
+        return None
+    try:
+        return read_json(cache_file)
+    except (OSError, ValueError):
+        return None
+
+def _store_docker_abi_details(image_id: str, abi_details: dict):
+    """Caches the ABI details detected inside a Docker image."""
+    DOCKER_ABI_CACHE_PATH.mkdir(parents=True, exist_ok=True)
+    write_json(_docker_abi_cache_file(image_id), abi_details)
+
+def _open_archived_file(tar: tarfile.TarFile, path: str):
+    """Returns a file object for the first member of the archive Docker returns for path."""
+    member = tar.next()
+    extracted_file = tar.extractfile(member) if member is not None else None
+    if extracted_file is None:
+        raise FileNotFoundError(f"Could not extract {Path(path).name} from container archive.")
+    return extracted_file
+
+class _ChunkStream(io.RawIOBase):
+    """Read-only file object over an iterator of byte chunks, such as a Docker archive stream."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._current = memoryview(b"")
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._current:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._current = memoryview(chunk)
+        size = min(len(buffer), len(self._current))
+        buffer[:size] = self._current[:size]
+        self._current = self._current[size:]
+        return size
+
+def _open_container_archive(container, path: str) -> tarfile.TarFile:
+    """Opens the tar stream of path in a container without collecting it in memory first."""
+    bits, _ = container.get_archive(path)
+    # In stream mode tarfile reads bufsize bytes at a time (10 KiB by default)
+    return tarfile.open(fileobj=io.BufferedReader(_ChunkStream(bits), buffer_size=1 << 20), mode="r|", bufsize=1 << 20)
+
+def _read_container_file(container, path: str) -> bytes:
+    """Reads a single file out of a container."""
+    with _open_container_archive(container, path) as tar:
+        return _open_archived_file(tar, path).read()
+
+def _copy_container_file(container, path: str, destination: Path):
+    """Copies a single (possibly large binary) file out of a container to destination."""
+    with _open_container_archive(container, path) as tar:
+        with open(destination, 'wb') as f:
+            shutil.copyfileobj(_open_archived_file(tar, path), f, length=1 << 20)
+
+def _sdist_to_tar(sdist_path: Path, prefix: str):
+    """
+    Converts an sdist into a tar archive whose members are placed under prefix, for
+    put_archive. Members are streamed from the zip one at a time into a spooled
+    temporary file, so only small sdists are held in memory. Unsafe member names are skipped.
+    """
+    tar_file = tempfile.SpooledTemporaryFile(max_size=32 << 20)
+    with zipfile.ZipFile(sdist_path, 'r') as sdist_zip, tarfile.open(fileobj=tar_file, mode="w") as tar:
+        prefix_info = tarfile.TarInfo(prefix)
+        prefix_info.type = tarfile.DIRTYPE
+        prefix_info.mode = 0o755
+        tar.addfile(prefix_info)
+        for info in sdist_zip.infolist():
+            name = info.filename.rstrip("/")
+            if not name or name.startswith("/") or ".." in Path(name).parts:
+                continue
+            tar_info = tarfile.TarInfo(f"{prefix}/{name}")
+            tar_info.mtime = int(time.mktime(info.date_time + (0, 0, -1)))
+            if info.is_dir():
+                tar_info.type = tarfile.DIRTYPE
+                tar_info.mode = 0o755
+                tar.addfile(tar_info)
+            else:
+                tar_info.size = info.file_size
+                tar_info.mode = ((info.external_attr >> 16) & 0o777) or 0o644
+                with sdist_zip.open(info) as member:
+                    tar.addfile(tar_info, member)
+    tar_file.seek(0)
+    return tar_file
+
+def _report_container_logs(container, report_progress):
+    """
+    Forwards the output of a running container as it arrives.
+
+    Each chunk of the log stream is reported as one message holding all of its
+    complete lines rather than one message per line. An incremental decoder keeps
+    multi-byte characters that straddle two chunks intact.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    # Text after the last newline; kept as parts so a very long line is not rebuilt per chunk
+    pending = []
+    for chunk in container.logs(stream=True, follow=True):
+        text = decoder.decode(chunk)
+        complete, newline, rest = text.rpartition("\n")
+        if newline:
+            pending.append(complete)
+            lines = "".join(pending)
+            pending = []
+            report_progress(DOCKER_LOG_PREFIX + lines.replace("\n", "\n" + DOCKER_LOG_PREFIX))
+        if rest:
+            pending.append(rest)
+    pending.append(decoder.decode(b"", final=True))
+    remainder = "".join(pending)
+    if remainder:
+        report_progress(DOCKER_LOG_PREFIX + remainder)
+
 def build_plugin_in_docker(sdist_path: Path, build_dir: Path, target: dict, plugin_name: str, progress_callback=None):
-    """Builds a plugin inside a Docker container."""
+    """
+    Builds a plugin inside a Docker container.
+
+    Like build_plugin_for_target, build_dir may be reused between calls: on Linux
+    hosts the meson build directory lives in the mounted source tree, and is only
+    configured again when it is missing or the image changed, so ninja rebuilds just
+    what changed. On other hosts (see DOCKER_BIND_MOUNT_SOURCES) the sdist is copied
+    into the container instead. Compiler output is also cached with ccache in a host directory shared by all
+    containers, which meson picks up by itself.
+    """
     def report_progress(message):
         if progress_callback:
             progress_callback(message)
 
-    client = docker.from_env()
+    if _get_docker() is None:
+        raise RuntimeError("Docker builds require the 'docker' Python package. Install it with: pip install docker")
+    client = _get_docker_client()
+    if client is None:
+        raise RuntimeError("Docker builds require a running Docker daemon.")
     image_name = target["docker_image"]
 
     arch = target.get("arch", "unknown_arch")
     
-    report_progress(f"  - Pulling Docker image '{image_name}' (if necessary)...")
-    client.images.pull(image_name)
+    image, has_dependencies = _get_docker_build_image(client, image_name, report_progress)
+    install_dependencies = "" if has_dependencies else "\n    ".join(
+        ['echo "--- Installing build dependencies ---"'] + DOCKER_BUILD_DEPENDENCY_COMMANDS
+    )
 
     source_dir = build_dir / "src"
-    if source_dir.exists():
-        shutil.rmtree(source_dir)
-        
-    with zipfile.ZipFile(sdist_path, 'r') as sdist_zip:
-        sdist_zip.extractall(source_dir)
-        
-    from fourdst.core.platform import ABI_DETECTOR_CPP_SRC, ABI_DETECTOR_MESON_SRC
+    image_stamp_file = build_dir / ".docker_image_id"
+    image_changed = False
+    if DOCKER_BIND_MOUNT_SOURCES:
+        _sync_sdist_sources(sdist_path, source_dir, build_dir / ".sdist_state.json", report_progress)
+        # A build directory configured with another image's toolchain can't be reused
+        image_changed = not image_stamp_file.exists() or image_stamp_file.read_text() != image.id
+
+    from fourdst.core.platform import ABI_DETECTOR_CPP_SRC
     build_script = f"""
     set -e
-    echo "--- Installing build dependencies ---"
-    export PATH="/opt/python/cp313-cp313/bin:$PATH"
-    dnf install -y openssl-devel
-    pip install meson ninja cmake
+    export PATH="{DOCKER_PYTHON_BIN}:$PATH"
+    {install_dependencies}
     
-    echo "--- Configuring with Meson ---"
-    meson setup /build/meson_build
+    {"rm -rf /build/meson_build" if image_changed else ""}
+    if [ ! -f /build/meson_build/build.ninja ]; then
+        echo "--- Configuring with Meson ---"
+        meson setup /build/meson_build
+    fi
     echo "--- Compiling with Meson ---"
     meson compile -C /build/meson_build
+    find /build/meson_build -name {shlex.quote(f"lib{plugin_name}.so")} > /build/{CONTAINER_LIB_PATH_FILE}
+    """
 
+    # The ABI of an image only depends on its toolchain, so only characterize it once.
+    abi_details = _load_docker_abi_details(image.id)
+    if abi_details is not None:
+        report_progress(f"  - Using cached ABI details for '{image_name}'.")
+    else:
+        build_script += f"""
     echo "--- Running ABI detector ---"
     mkdir -p /tmp/abi && cd /tmp/abi
 
@@ -127,96 +567,83 @@ def build_plugin_in_docker(sdist_path: Path, build_dir: Path, target: dict, plug
 {ABI_DETECTOR_CPP_SRC}
 EOF
 
-    cat > meson.build << 'EOF'
-{ABI_DETECTOR_MESON_SRC}
-EOF
-
-    meson setup build && meson compile -C build
-    ./build/detector > /build/abi_details.txt
+    # A single source file needs no meson project, which saves a configure step
+    ${{CXX:-c++}} -std=c++23 main.cpp -o detector
+    ./detector > /build/abi_details.txt
     """
 
 
     container_build_dir = Path("/build")
+    DOCKER_CCACHE_PATH.mkdir(parents=True, exist_ok=True)
     
+    volumes = {str(DOCKER_CCACHE_PATH.resolve()): {'bind': CONTAINER_CCACHE_DIR, 'mode': 'rw'}}
+    if DOCKER_BIND_MOUNT_SOURCES:
+        volumes[str(source_dir.resolve())] = {'bind': str(container_build_dir), 'mode': 'rw'}
+
     report_progress("  - Running build container...")
-    container = client.containers.run(
-        image=image_name,
+    container = client.containers.create(
+        image=image.id,
         command=["/bin/sh", "-c", build_script],
-        volumes={str(source_dir.resolve()): {'bind': str(container_build_dir), 'mode': 'rw'}},
+        volumes=volumes,
+        # Compilers are compared by content: images are re-pulled and rebuilt over time
+        environment={"CCACHE_DIR": CONTAINER_CCACHE_DIR, "CCACHE_COMPILERCHECK": "content"},
         working_dir=str(container_build_dir),
-        detach=True
-    )
-    
-    for line in container.logs(stream=True, follow=True):
-        report_progress(f"    [docker] {line.decode('utf-8').strip()}")
-        
-    result = container.wait()
-    if result["StatusCode"] != 0:
-        log_output = container.logs()
-        container.remove()
-        raise subprocess.CalledProcessError(result["StatusCode"], f"Build inside Docker failed. Full log:\n{log_output.decode('utf-8')}")
-
-    report_progress("  - Locating compiled library in container...")
-    meson_build_dir_str = (container_build_dir / "meson_build").as_posix()
-    expected_lib_name = f"lib{plugin_name}.so"
-    
-    find_cmd = f"find {meson_build_dir_str} -name {expected_lib_name}"
-    
-    find_output = client.containers.run(
-        image=image_name,
-        command=["/bin/sh", "-c", find_cmd],
-        volumes={str(source_dir.resolve()): {'bind': str(container_build_dir), 'mode': 'ro'}},
-        remove=True,
-        detach=False
     )
-    found_path_str = find_output.decode('utf-8').strip()
-    if not found_path_str:
+    # The container is removed however the build ends, including on errors and interrupts
+    try:
+        if not DOCKER_BIND_MOUNT_SOURCES:
+            report_progress("  - Copying sources into the container...")
+            with _sdist_to_tar(sdist_path, container_build_dir.name) as sources_tar:
+                container.put_archive("/", sources_tar)
+        container.start()
+
+        if progress_callback:
+            _report_container_logs(container, report_progress)
+        # Otherwise nobody reads the output as it comes; the full log is still fetched on failure
+
+        result = container.wait()
+        if result["StatusCode"] != 0:
+            log_output = container.logs()
+            raise subprocess.CalledProcessError(result["StatusCode"], f"Build inside Docker failed. Full log:\n{log_output.decode('utf-8')}")
+        if DOCKER_BIND_MOUNT_SOURCES:
+            image_stamp_file.write_text(image.id)
+
+        # The build script already looked for the library, so no second container is started for it
+        report_progress("  - Locating compiled library in container...")
+        expected_lib_name = f"lib{plugin_name}.so"
+        found_paths = _read_container_file(container, str(container_build_dir / CONTAINER_LIB_PATH_FILE)).decode('utf-8').splitlines()
+        if not found_paths:
             raise FileNotFoundError(f"Could not locate '{expected_lib_name}' inside the container.")
-    compiled_lib_path_in_container = Path(found_path_str)
-
-    # Use the tarfile module for robust extraction
-    bits, _ = container.get_archive(str(container_build_dir / "abi_details.txt"))
-    with tarfile.open(fileobj=io.BytesIO(b''.join(bits))) as tar:
-        extracted_file = None
-        for member in tar.getmembers():
-            if member.isfile():
-                extracted_file = tar.extractfile(member)
-                break
-        if not extracted_file:
-            raise FileNotFoundError("Could not extract abi_details.txt from container archive.")
-        abi_details_content = extracted_file.read()
-    
-    abi_details = {}
-    for line in abi_details_content.decode('utf-8').strip().split('\n'):
-        if '=' in line:
-            key, value = line.split('=', 1)
-            abi_details[key.strip()] = value.strip()
-    
-    compiler = abi_details.get('compiler', 'unk_compiler')
-    stdlib = abi_details.get('stdlib', 'unk_stdlib')
-    stdlib_version = abi_details.get('stdlib_version', 'unk_stdlib_version')
-    abi = abi_details.get('abi', 'unk_abi')
-    abi_string = f"{compiler}-{stdlib}-{stdlib_version}-{abi}"
-    
-    final_target = {
-        "triplet": f"{arch}-{abi_details.get('os', 'linux')}",
-        "abi_signature": abi_string,
-        "is_native": False,
-        "cross_file": None,
-        "docker_image": image_name,
-        "arch": arch
-    }
-    
-    local_lib_path = build_dir / compiled_lib_path_in_container.name
-    bits, _ = container.get_archive(str(compiled_lib_path_in_container))
-    with tarfile.open(fileobj=io.BytesIO(b''.join(bits))) as tar:
-        member = tar.getmembers()[0]
-        extracted_file = tar.extractfile(member)
-        if not extracted_file:
-            raise FileNotFoundError(f"Could not extract {local_lib_path.name} from container archive.")
-        with open(local_lib_path, 'wb') as f:
-            f.write(extracted_file.read())
-            
-    container.remove()
-    
+        compiled_lib_path_in_container = Path(found_paths[0])
+
+        if abi_details is None:
+            abi_details_content = _read_container_file(container, str(container_build_dir / "abi_details.txt"))
+
+            abi_details = {}
+            for line in abi_details_content.decode('utf-8').strip().split('\n'):
+                if '=' in line:
+                    key, value = line.split('=', 1)
+                    abi_details[key.strip()] = value.strip()
+            _store_docker_abi_details(image.id, abi_details)
+
+        compiler = abi_details.get('compiler', 'unk_compiler')
+        stdlib = abi_details.get('stdlib', 'unk_stdlib')
+        stdlib_version = abi_details.get('stdlib_version', 'unk_stdlib_version')
+        abi = abi_details.get('abi', 'unk_abi')
+        abi_string = f"{compiler}-{stdlib}-{stdlib_version}-{abi}"
+
+        final_target = {
+            "triplet": f"{arch}-{abi_details.get('os', 'linux')}",
+            "abi_signature": abi_string,
+            "is_native": False,
+            "cross_file": None,
+            "docker_image": image_name,
+            "arch": arch
+        }
+
+        local_lib_path = build_dir / compiled_lib_path_in_container.name
+        _copy_container_file(container, str(compiled_lib_path_in_container), local_lib_path)
+    finally:
+        container.remove(force=True)
+
     return local_lib_path, final_target
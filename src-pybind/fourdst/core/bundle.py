@@ -42,6 +42,7 @@ CHANGES REQUIRED FOR CLIENTS:
 
 import os
 import sys
+import copy
 import shutil
 import datetime
 import yaml
@@ -52,18 +53,28 @@ import subprocess
 import json
 import logging
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, Callable
 
 from fourdst.core.platform import get_platform_identifier, get_macos_targeted_platform_identifier
-from fourdst.core.utils import run_command, calculate_sha256
-from fourdst.core.build import get_available_build_targets, build_plugin_for_target, build_plugin_in_docker
+from fourdst.core.utils import (
+    run_command, calculate_sha256, load_yaml, dump_yaml, read_json, write_json, copy_zip_member, add_files_to_zip, HASH_CHUNK_SIZE
+)
+from fourdst.core.build import (
+    get_available_build_targets, build_plugin_for_target, build_plugin_in_docker,
+    configure_meson_build_dir, get_target_build_dir, find_shared_library, MAX_PARALLEL_BUILDS, MAX_PARALLEL_DOCKER_BUILDS
+)
 from fourdst.core.platform import is_abi_compatible
-from fourdst.core.config import LOCAL_TRUST_STORE_PATH
+from fourdst.core.config import LOCAL_TRUST_STORE_PATH, CACHE_PATH, BUNDLE_ZIP_COMPRESSLEVEL, PRECOMPRESSED_SUFFIXES
 
-from cryptography.hazmat.primitives import serialization, hashes
-from cryptography.hazmat.primitives.asymmetric import padding, rsa, ed25519
-from cryptography.exceptions import InvalidSignature
-import cryptography
+# Bundle files hashed concurrently when signing or validating
+MAX_HASH_WORKERS = 8
+
+# Parsed bundle manifests, keyed by path and validated against (st_mtime_ns, st_size)
+_manifest_cache: Dict[Path, tuple] = {}
+
+# Signing fingerprints of the trust store's PEM keys, validated per key against (st_mtime_ns, st_size)
+TRUSTED_KEY_INDEX = CACHE_PATH / "trusted_key_index.json"
 
 # Configure logging to go to stderr only, never stdout
 logging.basicConfig(stream=sys.stderr, level=logging.INFO)
@@ -121,130 +132,308 @@ def create_bundle(
         else:
             host_platform = get_platform_identifier()
 
+        # Every artifact of the bundle shares one timestamp
+        bundled_on = datetime.datetime.now().isoformat()
         manifest = {
             "bundleName": bundle_name,
             "bundleVersion": bundle_version,
             "bundleAuthor": bundle_author,
             "bundleComment": bundle_comment or "Created with fourdst",
-            "bundledOn": datetime.datetime.now().isoformat(),
+            "bundledOn": bundled_on,
             "bundlePlugins": {}
         }
         
         report_progress("Creating bundle...")
-        for plugin_dir in plugin_dirs:
-            plugin_name = plugin_dir.name
-            report_progress(f"--> Processing plugin: {plugin_name}")
-
-            report_progress(f"    - Compiling for target platform...")
-            build_dir = plugin_dir / "builddir"
-            if build_dir.exists():
-                shutil.rmtree(build_dir)
-
-            run_command(["meson", "setup", "builddir"], cwd=plugin_dir, env=build_env)
-            run_command(["meson", "compile", "-C", "builddir"], cwd=plugin_dir, env=build_env)
-
-            compiled_lib = next(build_dir.glob("lib*.so"), None) or next(build_dir.glob("lib*.dylib"), None)
-            if not compiled_lib:
-                raise FileNotFoundError(f"Could not find compiled library for {plugin_name}")
-
-            report_progress("    - Packaging source code (respecting .gitignore)...")
-            sdist_path = staging_dir / f"{plugin_name}_src.zip"
-            
-            git_check = subprocess.run(["git", "rev-parse", "--is-inside-work-tree"], cwd=plugin_dir, capture_output=True, text=True, check=False)
-            files_to_include = []
-            if git_check.returncode == 0:
-                result = run_command(["git", "ls-files", "--cached", "--others", "--exclude-standard"], cwd=plugin_dir)
-                files_to_include = [plugin_dir / f for f in result.stdout.strip().split('\n') if f]
-            else:
-                report_progress(f"    - Warning: '{plugin_dir.name}' is not a git repository. Packaging all files.")
-                for root, _, files in os.walk(plugin_dir):
-                    if 'builddir' in root:
-                        continue
-                    for file in files:
-                        files_to_include.append(Path(root) / file)
-
-            with zipfile.ZipFile(sdist_path, 'w', zipfile.ZIP_DEFLATED) as sdist_zip:
-                for file_path in files_to_include:
-                    if file_path.is_file():
-                        sdist_zip.write(file_path, file_path.relative_to(plugin_dir))
-
-            binaries_dir = staging_dir / "bin"
-            binaries_dir.mkdir(exist_ok=True)
-            
-            base_name = compiled_lib.stem
-            ext = compiled_lib.suffix
-            triplet = host_platform["triplet"]
-            abi_signature = host_platform["abi_signature"]
-            tagged_filename = f"{base_name}.{triplet}.{abi_signature}{ext}"
-            staged_lib_path = binaries_dir / tagged_filename
-            
-            report_progress(f"    - Staging binary as: {tagged_filename}")
-            shutil.copy(compiled_lib, staged_lib_path)
-
-            manifest["bundlePlugins"][plugin_name] = {
-                "sdist": {
-                    "path": sdist_path.name,
-                    "sdistBundledOn": datetime.datetime.now().isoformat(),
-                    "buildable": True
-                },
-                "binaries": [{
-                    "platform": {
-                        "triplet": host_platform["triplet"],
-                        "abi_signature": host_platform["abi_signature"],
-                        "arch": host_platform["arch"]
-                    },
-                    "path": staged_lib_path.relative_to(staging_dir).as_posix(),
-                    "compiledOn": datetime.datetime.now().isoformat()
-                }]
-            }
-
-        manifest_path = staging_dir / "manifest.yaml"
-        with open(manifest_path, 'w') as f:
-            yaml.dump(manifest, f, sort_keys=False)
+        # Plugins are independent, so they are built concurrently; meson compile is
+        # itself parallel, which is why only a few plugins run at once
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_BUILDS) as executor:
+            plugin_entries = executor.map(
+                lambda plugin_dir: _build_and_stage_plugin(
+                    plugin_dir, staging_dir, host_platform, build_env, target_macos_version, bundled_on, report_progress
+                ),
+                plugin_dirs
+            )
+            for plugin_name, plugin_entry in plugin_entries:
+                manifest["bundlePlugins"][plugin_name] = plugin_entry
 
         report_progress(f"\nPackaging final bundle: {output_bundle}")
-        with zipfile.ZipFile(output_bundle, 'w', zipfile.ZIP_DEFLATED) as bundle_zip:
-            for root, _, files in os.walk(staging_dir):
-                for file in files:
-                    file_path = Path(root) / file
-                    bundle_zip.write(file_path, file_path.relative_to(staging_dir))
+        with zipfile.ZipFile(output_bundle, 'w', zipfile.ZIP_DEFLATED, compresslevel=BUNDLE_ZIP_COMPRESSLEVEL) as bundle_zip:
+            staged_files = sorted(Path(root) / file for root, _, files in os.walk(staging_dir) for file in files)
+            add_files_to_zip(bundle_zip, (
+                (file_path, file_path.relative_to(staging_dir),
+                 zipfile.ZIP_STORED if file_path.suffix in PRECOMPRESSED_SUFFIXES else None)
+                for file_path in staged_files
+            ))
+            # The manifest goes last so that signing can later replace it in place
+            bundle_zip.writestr("manifest.yaml", dump_yaml(manifest, sort_keys=False))
 
         report_progress("\n✅ Bundle created successfully!")
     finally:
         if staging_dir.exists():
             shutil.rmtree(staging_dir)
 
-def _create_canonical_checksum_list(staging_dir: Path, manifest: dict) -> str:
+
+def _package_plugin_sources(plugin_dir: Path, sdist_path: Path, report_progress: Callable):
+    """
+    Writes the sources of a plugin project to sdist_path as a zip archive.
+
+    A git checkout with no local changes is exported with a single `git archive`.
+    With uncommitted or untracked files, the tracked and untracked-but-not-ignored
+    files are zipped from the working tree instead, and a non-git project has all
+    of its files (except the build directory) packaged.
+    """
+    git_check = subprocess.run(["git", "status", "--porcelain", "--", "."], cwd=plugin_dir, capture_output=True, text=True, check=False)
+    if git_check.returncode == 0 and not git_check.stdout.strip():
+        with open(sdist_path, 'wb') as sdist_file:
+            archive = subprocess.run(["git", "archive", "--format=zip", "HEAD"], cwd=plugin_dir, stdout=sdist_file, stderr=subprocess.PIPE, check=False)
+        if archive.returncode == 0:
+            return
+        # e.g. a repository without any commit yet
+
+    files_to_include = []
+    if git_check.returncode == 0:
+        result = run_command(["git", "ls-files", "--cached", "--others", "--exclude-standard"], cwd=plugin_dir)
+        files_to_include = [plugin_dir / f for f in result.stdout.strip().split('\n') if f]
+    else:
+        report_progress(f"    - Warning: '{plugin_dir.name}' is not a git repository. Packaging all files.")
+        for root, dirs, files in os.walk(plugin_dir):
+            dirs[:] = [d for d in dirs if d != 'builddir']
+            for file in files:
+                files_to_include.append(Path(root) / file)
+
+    # Sorted so that the same sources always give the same sdist, and so the same checksum
+    files_to_include.sort()
+    with zipfile.ZipFile(sdist_path, 'w', zipfile.ZIP_DEFLATED) as sdist_zip:
+        add_files_to_zip(sdist_zip, (
+            (file_path, file_path.relative_to(plugin_dir),
+             zipfile.ZIP_STORED if file_path.suffix in PRECOMPRESSED_SUFFIXES else None)
+            for file_path in files_to_include if file_path.is_file()
+        ))
+
+def _build_and_stage_plugin(
+    plugin_dir: Path,
+    staging_dir: Path,
+    host_platform: dict,
+    build_env: dict,
+    target_macos_version: str | None,
+    bundled_on: str,
+    report_progress: Callable
+) -> tuple[str, dict]:
+    """
+    Compiles one plugin project for the host, packages its sources and stages both
+    in staging_dir. Safe to run concurrently for different plugins.
+
+    Returns:
+        (plugin_name, manifest entry for bundlePlugins)
+    """
+    plugin_name = plugin_dir.name
+    report_progress(f"--> Processing plugin: {plugin_name}")
+
+    report_progress(f"    - Compiling for target platform...")
+    build_dir = plugin_dir / "builddir"
+    # Flags passed through the environment are only read by meson at configure time
+    build_stamp = {
+        "CXXFLAGS": build_env.get("CXXFLAGS"),
+        "LDFLAGS": build_env.get("LDFLAGS"),
+        "target_macos_version": target_macos_version
+    }
+    configure_meson_build_dir(plugin_dir, "builddir", [], build_stamp, env=build_env)
+    run_command(["meson", "compile", "-C", "builddir"], cwd=plugin_dir, env=build_env, stream=True)
+
+    compiled_lib = find_shared_library(build_dir)
+    if not compiled_lib:
+        raise FileNotFoundError(f"Could not find compiled library for {plugin_name}")
+
+    report_progress("    - Packaging source code (respecting .gitignore)...")
+    sdist_path = staging_dir / f"{plugin_name}_src.zip"
+    
+    _package_plugin_sources(plugin_dir, sdist_path, report_progress)
+
+    binaries_dir = staging_dir / "bin"
+    binaries_dir.mkdir(exist_ok=True)
+    
+    base_name = compiled_lib.stem
+    ext = compiled_lib.suffix
+    triplet = host_platform["triplet"]
+    abi_signature = host_platform["abi_signature"]
+    tagged_filename = f"{base_name}.{triplet}.{abi_signature}{ext}"
+    staged_lib_path = binaries_dir / tagged_filename
+    
+    report_progress(f"    - Staging binary as: {tagged_filename}")
+    shutil.copy(compiled_lib, staged_lib_path)
+
+    return plugin_name, {
+        "sdist": {
+            "path": sdist_path.name,
+            "sdistBundledOn": bundled_on,
+            "buildable": True
+        },
+        "binaries": [{
+            "platform": {
+                "triplet": host_platform["triplet"],
+                "abi_signature": host_platform["abi_signature"],
+                "arch": host_platform["arch"]
+            },
+            "path": staged_lib_path.relative_to(staging_dir).as_posix(),
+            "compiledOn": bundled_on
+        }]
+    }
+
+def _hash_zip_member(bundle_zip: zipfile.ZipFile, name: str) -> str:
+    """Calculates the SHA256 checksum of a zip member while it is inflated, without extracting it."""
+    sha256_hash = hashlib.sha256()
+    with bundle_zip.open(name) as member:
+        for byte_block in iter(lambda: member.read(HASH_CHUNK_SIZE), b""):
+            sha256_hash.update(byte_block)
+    return sha256_hash.hexdigest()
+
+def _create_canonical_checksum_list(source: Path | zipfile.ZipFile, manifest: dict,
+                                    known_checksums: Optional[Dict[str, str]] = None) -> str:
     """
     Creates a deterministic, sorted string of all file paths and their checksums.
+
+    source is either the directory a bundle was unpacked to or the open bundle zip
+    itself, in which case the files are hashed straight from the archive. Files
+    listed in known_checksums (path -> "sha256:...") are not hashed again.
     """
-    checksum_map = {}
+    known_checksums = known_checksums or {}
+    if isinstance(source, zipfile.ZipFile):
+        zip_names = set(source.namelist())
+        file_exists = lambda path_str: path_str in zip_names
+        hash_file = lambda path_str: _hash_zip_member(source, path_str)
+    else:
+        file_exists = lambda path_str: (source / path_str).exists()
+        hash_file = lambda path_str: calculate_sha256(source / path_str)
+
+    entries_to_hash = []
 
     for plugin_data in manifest.get('bundlePlugins', {}).values():
         sdist_info = plugin_data.get('sdist', {})
         if 'path' in sdist_info:
-            file_path = staging_dir / sdist_info['path']
-            if file_path.exists():
-                checksum = "sha256:" + calculate_sha256(file_path)
-                sdist_info['checksum'] = checksum
-                checksum_map[sdist_info['path']] = checksum
-            else:
+            if not file_exists(sdist_info['path']):
                 raise FileNotFoundError(f"sdist file not found: {sdist_info['path']}")
+            entries_to_hash.append(sdist_info)
 
         for binary in plugin_data.get('binaries', []):
             if 'path' in binary:
-                file_path = staging_dir / binary['path']
-                if file_path.exists():
-                    checksum = "sha256:" + calculate_sha256(file_path)
-                    binary['checksum'] = checksum
-                    checksum_map[binary['path']] = checksum
-                else:
+                if not file_exists(binary['path']):
                     raise FileNotFoundError(f"Binary file not found: {binary['path']}")
+                entries_to_hash.append(binary)
+
+    # hashlib releases the GIL while hashing, so the files are hashed side by side
+    with ThreadPoolExecutor(max_workers=MAX_HASH_WORKERS) as executor:
+        checksums = executor.map(
+            lambda entry: known_checksums.get(entry['path']) or "sha256:" + hash_file(entry['path']),
+            entries_to_hash
+        )
+        checksum_map = {}
+        for entry, checksum in zip(entries_to_hash, checksums):
+            entry['checksum'] = checksum
+            checksum_map[entry['path']] = entry['checksum']
 
     sorted_paths = sorted(checksum_map.keys())
     canonical_list = [f"{path}:{checksum_map[path]}" for path in sorted_paths]
     return "\n".join(canonical_list)
 
+def _write_bundle_member(bundle_zip: zipfile.ZipFile, arcname: str, content) -> None:
+    """Writes new bundle content (bytes, or a Path to a file) under arcname."""
+    if isinstance(content, Path):
+        compress_type = zipfile.ZIP_STORED if content.suffix in PRECOMPRESSED_SUFFIXES else None
+        bundle_zip.write(content, arcname, compress_type=compress_type)
+    else:
+        bundle_zip.writestr(arcname, content)
+
+def _replace_trailing_bundle_members(bundle_path: Path, replacements: Dict[str, Any]) -> bool:
+    """
+    Applies replacements in place when every member they replace or drop comes after
+    all the members that are kept, which is where _rewrite_bundle puts them.
+
+    The archive is cut at the first replaced member and the new content appended,
+    so signing or filling costs time in proportion to what changed rather than to
+    the bundle size. If writing fails, the cut off bytes are put back so the
+    bundle is left as it was.
+
+    Unlike the rename in _rewrite_bundle this is not atomic: if the process is killed
+    or the machine loses power while the new members are written, the bundle is
+    left without a central directory. The new members are synced to disk before the
+    central directory is written and the old tail truncated, and the result is
+    synced again before returning, so once this returns the bundle is durable.
+
+    zipfile has no public API for rewriting the end of an archive, so this sets
+    ZipFile's filelist, NameToInfo, start_dir and _didModify, which are the same
+    in CPython 3.10 through 3.13.
+
+    Returns:
+        False, without modifying the bundle, if the members are not at the end
+    """
+    with open(bundle_path, 'r+b') as bundle_file:
+        with zipfile.ZipFile(bundle_file, 'a', zipfile.ZIP_DEFLATED, compresslevel=BUNDLE_ZIP_COMPRESSLEVEL) as bundle_zip:
+            original_filelist = list(bundle_zip.filelist)
+            original_start_dir = bundle_zip.start_dir
+            kept = [info for info in original_filelist if info.filename not in replacements]
+            replaced = [info for info in original_filelist if info.filename in replacements]
+            cut_offset = min((info.header_offset for info in replaced), default=original_start_dir)
+            if any(info.header_offset >= cut_offset for info in kept):
+                return False
+
+            bundle_zip.fp.seek(cut_offset)
+            replaced_data = bundle_zip.fp.read(original_start_dir - cut_offset)
+            bundle_zip.filelist = kept
+            bundle_zip.NameToInfo = {info.filename: info for info in kept}
+            bundle_zip.start_dir = cut_offset
+            bundle_zip._didModify = True
+            try:
+                for arcname, content in replacements.items():
+                    if content is not None:
+                        _write_bundle_member(bundle_zip, arcname, content)
+                # Closing the archive writes the central directory and truncates the file
+                # after it, which must not reach the disk before the members it points at
+                bundle_file.flush()
+                os.fsync(bundle_file.fileno())
+            except BaseException:
+                # Closing the archive then writes the original central directory back
+                bundle_zip.fp.seek(cut_offset)
+                bundle_zip.fp.write(replaced_data)
+                bundle_zip.filelist = original_filelist
+                bundle_zip.NameToInfo = {info.filename: info for info in original_filelist}
+                bundle_zip.start_dir = original_start_dir
+                raise
+        os.fsync(bundle_file.fileno())
+    return True
+
+def _rewrite_bundle(bundle_path: Path, replacements: Dict[str, Any]):
+    """
+    Rewrites a bundle with some members replaced or added.
+
+    replacements maps archive names to new content (bytes, or a Path to a file), or
+    to None to drop the member. The new content always goes at the end of the
+    archive, so a later rewrite of the same members (such as re-signing) can be
+    done in place by _replace_trailing_bundle_members.
+
+    Otherwise every other member is copied over still compressed, so unchanged
+    binaries and sdists are not deflated again. The new archive is written next
+    to the bundle, synced to disk and renamed over it once complete.
+    """
+    if _replace_trailing_bundle_members(bundle_path, replacements):
+        return
+
+    temp_bundle_path = bundle_path.with_name(f".{bundle_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(temp_bundle_path, 'wb') as temp_file:
+            with zipfile.ZipFile(bundle_path, 'r') as source_zip, \
+                 zipfile.ZipFile(temp_file, 'w', zipfile.ZIP_DEFLATED, compresslevel=BUNDLE_ZIP_COMPRESSLEVEL) as bundle_zip:
+                for info in source_zip.infolist():
+                    if info.filename not in replacements:
+                        copy_zip_member(source_zip, bundle_zip, info.filename)
+                for arcname, content in replacements.items():
+                    if content is not None:
+                        _write_bundle_member(bundle_zip, arcname, content)
+            # Otherwise the rename can reach the disk before the data it points at
+            os.fsync(temp_file.fileno())
+        os.replace(temp_bundle_path, bundle_path)
+    finally:
+        temp_bundle_path.unlink(missing_ok=True)
+
 def edit_bundle_metadata(bundle_path: Path, metadata: dict, progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
     """
     Edits the metadata in the manifest of an existing bundle.
@@ -282,40 +471,24 @@ def edit_bundle_metadata(bundle_path: Path, metadata: dict, progress_callback: O
     if not bundle_path.exists() or not zipfile.is_zipfile(bundle_path):
         raise FileNotFoundError("Bundle is not a valid zip file.")
 
-    with zipfile.ZipFile(bundle_path, 'a') as zf:
+    with zipfile.ZipFile(bundle_path, 'r') as zf:
         if "manifest.yaml" not in zf.namelist():
             raise FileNotFoundError("manifest.yaml not found in bundle.")
 
-        with zf.open("manifest.yaml", 'r') as f:
-            manifest = yaml.safe_load(f)
-
-        _progress("Updating manifest...")
-        updated_fields = []
-        for key, value in metadata.items():
-            # Convert snake_case from JS to camelCase for YAML
-            camel_case_key = ''.join(word.capitalize() for word in key.split('_'))
-            camel_case_key = camel_case_key[0].lower() + camel_case_key[1:]
-            if value:
-                manifest[camel_case_key] = value
-                updated_fields.append(key)
-
-        # In-place update of the manifest requires creating a new zip file
-        # or rewriting the existing one, as 'a' mode can't update files.
-        # A simpler approach is to read all files, write to a new zip, and replace.
-        temp_bundle_path = bundle_path.with_suffix('.zip.tmp')
-        with zipfile.ZipFile(temp_bundle_path, 'w', zipfile.ZIP_DEFLATED) as temp_zf:
-            for item in zf.infolist():
-                if item.filename == "manifest.yaml":
-                    continue # Skip old manifest
-                buffer = zf.read(item.filename)
-                temp_zf.writestr(item, buffer)
-            
-            # Write the updated manifest
-            new_manifest_content = yaml.dump(manifest, Dumper=yaml.SafeDumper)
-            temp_zf.writestr("manifest.yaml", new_manifest_content)
+        manifest = load_yaml(zf.read("manifest.yaml"))
 
-    # Replace the original bundle with the updated one
-    shutil.move(temp_bundle_path, bundle_path)
+    _progress("Updating manifest...")
+    updated_fields = []
+    for key, value in metadata.items():
+        # Convert snake_case from JS to camelCase for YAML
+        camel_case_key = ''.join(word.capitalize() for word in key.split('_'))
+        camel_case_key = camel_case_key[0].lower() + camel_case_key[1:]
+        if value:
+            manifest[camel_case_key] = value
+            updated_fields.append(key)
+
+    # Only the manifest is written; every other member is left compressed as it is
+    _rewrite_bundle(bundle_path, {"manifest.yaml": dump_yaml(manifest, encoding='utf-8')})
     _progress("Metadata updated successfully.")
 
     return {
@@ -345,6 +518,10 @@ def sign_bundle(bundle_path: Path, private_key: Path, progress_callback: Optiona
             "error": "error message"
         }
     """
+    # cryptography loads OpenSSL bindings, so only pay for it when signing
+    from cryptography.hazmat.primitives import serialization, hashes
+    from cryptography.hazmat.primitives.asymmetric import padding, rsa, ed25519
+
     def report_progress(message):
         if progress_callback:
             progress_callback(message)
@@ -352,32 +529,16 @@ def sign_bundle(bundle_path: Path, private_key: Path, progress_callback: Optiona
             logging.info(message)
 
     report_progress(f"Signing bundle: {bundle_path}")
-    staging_dir = Path(tempfile.mkdtemp(prefix="fourdst_sign_"))
 
-    try:
-        with zipfile.ZipFile(bundle_path, 'r') as bundle_zip:
-            bundle_zip.extractall(staging_dir)
-
-        manifest_path = staging_dir / "manifest.yaml"
-        if not manifest_path.exists():
+    # Nothing is unpacked: files are hashed from the archive and only the manifest is rewritten
+    with zipfile.ZipFile(bundle_path, 'r') as bundle_zip:
+        if "manifest.yaml" not in bundle_zip.namelist():
             raise FileNotFoundError("manifest.yaml not found in bundle.")
 
         if private_key.suffix.lower() != ".pem":
             raise ValueError("Private key must be a .pem file.")
 
-        report_progress("  - Deriving public key fingerprint via openssl...")
-        proc = run_command(["openssl", "pkey", "-in", str(private_key), "-pubout", "-outform", "DER"], binary_output=True)
-        pub_der = proc.stdout
-        fingerprint = "sha256:" + hashlib.sha256(pub_der).hexdigest()
-        report_progress(f"  - Signing with key fingerprint: {fingerprint}")
-
-        with open(manifest_path, 'r') as f:
-            manifest = yaml.safe_load(f)
-
-        report_progress("  - Calculating and embedding file checksums...")
-        canonical_checksums = _create_canonical_checksum_list(staging_dir, manifest)
-
-        report_progress("  - Detecting key type...")
+        report_progress("  - Loading private key...")
         try:
             with open(private_key, "rb") as key_file:
                 private_key_obj = serialization.load_pem_private_key(
@@ -387,30 +548,29 @@ def sign_bundle(bundle_path: Path, private_key: Path, progress_callback: Optiona
         except Exception as e:
             raise ValueError(f"Could not load or parse private key: {e}")
 
+        pub_der = private_key_obj.public_key().public_bytes(
+            encoding=serialization.Encoding.DER,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        fingerprint = "sha256:" + hashlib.sha256(pub_der).hexdigest()
+        report_progress(f"  - Signing with key fingerprint: {fingerprint}")
+
+        manifest = load_yaml(bundle_zip.read("manifest.yaml"))
+
+        report_progress("  - Calculating and embedding file checksums...")
+        canonical_checksums = _create_canonical_checksum_list(bundle_zip, manifest)
+
         report_progress("  - Generating signature...")
+        data_to_sign = canonical_checksums.encode('utf-8')
         if isinstance(private_key_obj, ed25519.Ed25519PrivateKey):
-            report_progress("    - Ed25519 key detected. Using pkeyutl for signing.")
-            # pkeyutl with -rawin can be tricky with stdin, so we use a temporary file.
-            with tempfile.NamedTemporaryFile(delete=False) as temp_input_file:
-                temp_input_file.write(canonical_checksums.encode('utf-8'))
-                temp_input_path = temp_input_file.name
-            try:
-                signature_proc = run_command(
-                    ["openssl", "pkeyutl", "-sign", "-inkey", str(private_key), "-in", temp_input_path],
-                    binary_output=True
-                )
-            finally:
-                os.remove(temp_input_path)
+            report_progress("    - Ed25519 key detected.")
+            signature = private_key_obj.sign(data_to_sign)
         elif isinstance(private_key_obj, rsa.RSAPrivateKey):
-            report_progress("    - RSA key detected. Using dgst for signing.")
-            signature_proc = run_command(
-                ["openssl", "dgst", "-sha256", "-sign", str(private_key)],
-                input=canonical_checksums.encode('utf-8'),
-                binary_output=True
-            )
+            report_progress("    - RSA key detected. Using PKCS#1 v1.5 with SHA-256.")
+            signature = private_key_obj.sign(data_to_sign, padding.PKCS1v15(), hashes.SHA256())
         else:
             raise TypeError(f"Unsupported private key type: {type(private_key_obj)}")
-        signature_hex = signature_proc.stdout.hex()
+        signature_hex = signature.hex()
 
         manifest['bundleSignature'] = {
             'keyFingerprint': fingerprint,
@@ -418,28 +578,22 @@ def sign_bundle(bundle_path: Path, private_key: Path, progress_callback: Optiona
             'signedOn': datetime.datetime.now().isoformat()
         }
 
-        with open(manifest_path, 'w') as f:
-            yaml.dump(manifest, f, sort_keys=False)
-
-        report_progress(f"  - Repackaging bundle: {bundle_path}")
-        with zipfile.ZipFile(bundle_path, 'w', zipfile.ZIP_DEFLATED) as bundle_zip:
-            for root, _, files in os.walk(staging_dir):
-                for file in files:
-                    file_path = Path(root) / file
-                    bundle_zip.write(file_path, file_path.relative_to(staging_dir))
-
-        report_progress("\n✅ Bundle signed successfully!")
+    report_progress(f"  - Repackaging bundle: {bundle_path}")
+    # The manifest is serialized straight to the bytes that go into the archive
+    _rewrite_bundle(bundle_path, {"manifest.yaml": dump_yaml(manifest, sort_keys=False, encoding='utf-8')})
 
-    finally:
-        if staging_dir.exists():
-            shutil.rmtree(staging_dir)
+    report_progress("\n✅ Bundle signed successfully!")
 
-def validate_bundle(bundle_path: Path, progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+def validate_bundle(bundle_path: Path, progress_callback: Optional[Callable] = None,
+                    computed_checksums: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
     """
     Validates a bundle's integrity and checksums.
     
     REFACTORED: Now returns a JSON-serializable dictionary directly.
     Progress messages go only to the callback, never to stdout.
+
+    If computed_checksums is given, it is filled with the "sha256:..." checksum of
+    every binary hashed, keyed by archive path, so callers can reuse them.
     
     Returns:
         Dict containing validation results with structure:
@@ -465,26 +619,25 @@ def validate_bundle(bundle_path: Path, progress_callback: Optional[Callable] = N
     }
 
     report_progress(f"Validating bundle: {bundle_path}")
-    staging_dir = Path(tempfile.mkdtemp(prefix="fourdst_validate_"))
+    bundle_zip = None
 
     try:
-        # 1. Unpack the bundle
+        # 1. Open the bundle; files are checked and hashed straight from the archive
         try:
-            with zipfile.ZipFile(bundle_path, 'r') as bundle_zip:
-                bundle_zip.extractall(staging_dir)
-            report_progress("  - Bundle unpacked successfully.")
+            bundle_zip = zipfile.ZipFile(bundle_path, 'r')
+            zip_names = set(bundle_zip.namelist())
+            report_progress("  - Bundle opened successfully.")
         except zipfile.BadZipFile:
             results['errors'].append(f"'{bundle_path.name}' is not a valid zip file.")
             return results
 
         # 2. Manifest validation
-        manifest_path = staging_dir / "manifest.yaml"
-        if not manifest_path.exists():
+        if "manifest.yaml" not in zip_names:
             results['errors'].append("Missing manifest.yaml file.")
             return results
 
         try:
-            manifest = yaml.safe_load(manifest_path.read_text())
+            manifest = load_yaml(bundle_zip.read("manifest.yaml"))
             if not manifest:
                 results['warnings'].append("Manifest file is empty.")
                 manifest = {}
@@ -503,14 +656,14 @@ def validate_bundle(bundle_path: Path, progress_callback: Optional[Callable] = N
         if not plugins:
             results['warnings'].append("Manifest 'bundlePlugins' section is empty or missing.")
 
+        binaries_to_check = []
         for name, data in plugins.items():
             sdist_info = data.get('sdist', {})
             sdist_path_str = sdist_info.get('path')
             if not sdist_path_str:
                 results['errors'].append(f"sdist path not defined for plugin '{name}'.")
             else:
-                sdist_path = staging_dir / sdist_path_str
-                if not sdist_path.exists():
+                if sdist_path_str not in zip_names:
                     results['errors'].append(f"sdist file not found: {sdist_path_str}")
 
             for binary in data.get('binaries', []):
@@ -519,8 +672,7 @@ def validate_bundle(bundle_path: Path, progress_callback: Optional[Callable] = N
                     results['errors'].append(f"Binary entry for '{name}' is missing a 'path'.")
                     continue
                 
-                bin_path = staging_dir / bin_path_str
-                if not bin_path.exists():
+                if bin_path_str not in zip_names:
                     results['errors'].append(f"Binary file not found: {bin_path_str}")
                     continue
 
@@ -528,9 +680,21 @@ def validate_bundle(bundle_path: Path, progress_callback: Optional[Callable] = N
                 if not expected_checksum:
                     results['warnings'].append(f"Checksum not defined for binary '{bin_path_str}'.")
                 else:
-                    actual_checksum = "sha256:" + calculate_sha256(bin_path)
-                    if actual_checksum != expected_checksum:
-                        results['errors'].append(f"Checksum mismatch for {bin_path_str}")
+                    binaries_to_check.append((bin_path_str, expected_checksum))
+
+        # Hash all binaries side by side (hashlib and zlib release the GIL), reporting in manifest order
+        # Each archive member is hashed once, even if several manifest entries point at it
+        paths_to_hash = list(dict.fromkeys(bin_path_str for bin_path_str, _ in binaries_to_check))
+        with ThreadPoolExecutor(max_workers=MAX_HASH_WORKERS) as executor:
+            actual_checksums = dict(zip(
+                paths_to_hash,
+                executor.map(lambda bin_path_str: "sha256:" + _hash_zip_member(bundle_zip, bin_path_str), paths_to_hash)
+            ))
+        if computed_checksums is not None:
+            computed_checksums.update(actual_checksums)
+        for bin_path_str, expected_checksum in binaries_to_check:
+            if actual_checksums[bin_path_str] != expected_checksum:
+                results['errors'].append(f"Checksum mismatch for {bin_path_str}")
 
         # 4. Signature check (presence only)
         if 'bundleSignature' not in manifest:
@@ -558,11 +722,69 @@ def validate_bundle(bundle_path: Path, progress_callback: Optional[Callable] = N
             'status': 'failed'
         }
     finally:
-        if staging_dir.exists():
-            shutil.rmtree(staging_dir)
+        if bundle_zip is not None:
+            bundle_zip.close()
 
     return results
 
+def _pem_key_fingerprint(pem_data: bytes) -> str:
+    """Computes the signing fingerprint (SHA256 of the DER SubjectPublicKeyInfo) of a PEM public key."""
+    from cryptography.hazmat.primitives import serialization
+    pub_der = (serialization.load_pem_public_key(pem_data)
+               .public_bytes(encoding=serialization.Encoding.DER, format=serialization.PublicFormat.SubjectPublicKeyInfo))
+    return "sha256:" + hashlib.sha256(pub_der).hexdigest()
+
+def _find_trusted_key(fingerprint: str) -> Optional[Path]:
+    """
+    Finds the trust store key with the given signing fingerprint.
+
+    Fingerprints are kept in TRUSTED_KEY_INDEX, so a key is only parsed again when
+    it is new or changed on disk. When the index already points at an unchanged key
+    with this fingerprint, the trust store is not walked at all.
+    """
+    try:
+        index = read_json(TRUSTED_KEY_INDEX)
+    except (OSError, ValueError):
+        index = {}
+
+    for key_path, entry in index.items():
+        if entry.get('fingerprint') == fingerprint:
+            try:
+                st = os.stat(key_path)
+            except OSError:
+                break
+            if (st.st_mtime_ns, st.st_size) == (entry.get('mtime_ns'), entry.get('size')):
+                return Path(key_path)
+            break
+
+    # Refresh the index, dropping removed keys and parsing new or changed ones
+    new_index = {}
+    trusted_key_path = None
+    if LOCAL_TRUST_STORE_PATH.exists():
+        for key_file in LOCAL_TRUST_STORE_PATH.rglob("*.pem"):
+            try:
+                st = key_file.stat()
+            except OSError:
+                continue
+            entry = index.get(str(key_file))
+            if not entry or (entry.get('mtime_ns'), entry.get('size')) != (st.st_mtime_ns, st.st_size):
+                try:
+                    key_fingerprint = _pem_key_fingerprint(key_file.read_bytes())
+                except Exception:
+                    key_fingerprint = None # Not a usable public key; remembered so it is not parsed again
+                entry = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'fingerprint': key_fingerprint}
+            new_index[str(key_file)] = entry
+            if trusted_key_path is None and entry['fingerprint'] == fingerprint:
+                trusted_key_path = key_file
+
+    if new_index != index:
+        try:
+            CACHE_PATH.mkdir(parents=True, exist_ok=True)
+            write_json(TRUSTED_KEY_INDEX, new_index)
+        except OSError as e:
+            logging.warning(f"Could not write trusted key index: {e}")
+    return trusted_key_path
+
 def inspect_bundle(bundle_path: Path) -> Dict[str, Any]:
     """
     Performs a comprehensive inspection of a bundle, returning a structured report.
@@ -587,6 +809,13 @@ def inspect_bundle(bundle_path: Path) -> Dict[str, Any]:
             "error": "error message"
         }
     """
+    try:
+        from cryptography.hazmat.primitives import serialization, hashes
+        from cryptography.hazmat.primitives.asymmetric import padding, rsa, ed25519
+        from cryptography.exceptions import InvalidSignature
+    except ImportError:
+        serialization = None
+
     try:
         report = {
             'success': True,
@@ -599,7 +828,8 @@ def inspect_bundle(bundle_path: Path) -> Dict[str, Any]:
 
         # 1. Basic validation (file integrity, checksums)
         # Pass a no-op callback to prevent any progress output
-        validation_result = validate_bundle(bundle_path, progress_callback=lambda msg: None)
+        binary_checksums = {}
+        validation_result = validate_bundle(bundle_path, progress_callback=lambda msg: None, computed_checksums=binary_checksums)
         report['validation'] = validation_result
         
         # If basic validation fails, return early
@@ -608,14 +838,9 @@ def inspect_bundle(bundle_path: Path) -> Dict[str, Any]:
             if any("not a valid zip file" in e or "Missing manifest.yaml" in e for e in critical_errors):
                 return report
 
-        staging_dir = Path(tempfile.mkdtemp(prefix="fourdst_inspect_"))
-        try:
-            with zipfile.ZipFile(bundle_path, 'r') as bundle_zip:
-                bundle_zip.extractall(staging_dir)
-            
-            manifest_path = staging_dir / "manifest.yaml"
-            with open(manifest_path, 'r') as f:
-                manifest = yaml.safe_load(f) or {}
+        # Everything is read straight from the archive; nothing needs to be unpacked
+        with zipfile.ZipFile(bundle_path, 'r') as bundle_zip:
+            manifest = load_yaml(bundle_zip.read("manifest.yaml")) or {}
 
             report['manifest'] = manifest
 
@@ -624,26 +849,15 @@ def inspect_bundle(bundle_path: Path) -> Dict[str, Any]:
             fingerprint = sig_info.get('keyFingerprint')
             signature_hex = sig_info.get('signature')
 
-            if not cryptography:
+            if serialization is None:
                 report['signature']['status'] = 'UNSUPPORTED'
                 report['signature']['reason'] = 'cryptography module not installed.'
             elif not fingerprint or not signature_hex:
                 report['signature']['status'] = 'UNSIGNED'
             else:
                 report['signature']['fingerprint'] = fingerprint
-                trusted_key_path = None
-                if LOCAL_TRUST_STORE_PATH.exists():
-                    for key_file in LOCAL_TRUST_STORE_PATH.rglob("*.pem"):
-                        try:
-                            pub_der = (serialization.load_pem_public_key(key_file.read_bytes())
-                                       .public_bytes(encoding=serialization.Encoding.DER, format=serialization.PublicFormat.SubjectPublicKeyInfo))
-                            pub_key_fingerprint = "sha256:" + hashlib.sha256(pub_der).hexdigest()
-                            if pub_key_fingerprint == fingerprint:
-                                trusted_key_path = key_file
-                                break
-                        except Exception:
-                            continue
-                
+                trusted_key_path = _find_trusted_key(fingerprint)
+
                 if not trusted_key_path:
                     report['signature']['status'] = 'UNTRUSTED'
                 else:
@@ -651,8 +865,9 @@ def inspect_bundle(bundle_path: Path) -> Dict[str, Any]:
                         pub_key_obj = serialization.load_pem_public_key(trusted_key_path.read_bytes())
                         signature = bytes.fromhex(signature_hex)
                         
-                        # Re-calculate checksums from disk to verify against the signature
-                        data_to_verify = _create_canonical_checksum_list(staging_dir, manifest).encode('utf-8')
+                        # Re-calculate checksums from the archive to verify against the signature
+                        # (binaries were already hashed by the validation above)
+                        data_to_verify = _create_canonical_checksum_list(bundle_zip, manifest, binary_checksums).encode('utf-8')
 
                         if isinstance(pub_key_obj, ed25519.Ed25519PublicKey):
                             pub_key_obj.verify(signature, data_to_verify)
@@ -689,10 +904,6 @@ def inspect_bundle(bundle_path: Path) -> Dict[str, Any]:
                         compatible_found = True
                 report['plugins'][name]['compatible_found'] = compatible_found
 
-        finally:
-            if staging_dir.exists():
-                shutil.rmtree(staging_dir)
-
         return report
 
     except Exception as e:
@@ -731,58 +942,41 @@ def clear_bundle(bundle_path: Path, progress_callback: Optional[Callable] = None
             logging.info(message)
 
     report_progress(f"Clearing binaries from bundle: {bundle_path.name}")
-    staging_dir = Path(tempfile.mkdtemp(prefix="fourdst_clear_"))
 
-    try:
-        # 1. Unpack the bundle
-        report_progress("  - Unpacking bundle...")
-        with zipfile.ZipFile(bundle_path, 'r') as bundle_zip:
-            bundle_zip.extractall(staging_dir)
-
-        # 2. Read the manifest
-        manifest_path = staging_dir / "manifest.yaml"
-        if not manifest_path.is_file():
+    # 1. Read the manifest
+    with zipfile.ZipFile(bundle_path, 'r') as bundle_zip:
+        try:
+            manifest = load_yaml(bundle_zip.read("manifest.yaml"))
+        except KeyError:
             raise FileNotFoundError("Bundle is invalid. Missing manifest.yaml.")
-        
-        with open(manifest_path, 'r') as f:
-            manifest = yaml.safe_load(f)
+        member_names = bundle_zip.namelist()
 
-        # 3. Clear binaries and signatures from manifest
-        report_progress("  - Clearing binary and signature information from manifest...")
-        manifest.pop('bundleSignature', None)
-        
-        for plugin_name, plugin_data in manifest.get('bundlePlugins', {}).items():
-            if 'binaries' in plugin_data:
-                report_progress(f"    - Clearing binaries for plugin '{plugin_name}'")
-                plugin_data['binaries'] = []
-        
-        # 4. Delete the binaries directory and signature file from disk
-        bin_dir = staging_dir / "bin"
-        if bin_dir.is_dir():
-            shutil.rmtree(bin_dir)
-            report_progress("  - Removed 'bin/' directory.")
-
-        sig_file = staging_dir / "manifest.sig"
-        if sig_file.is_file():
-            sig_file.unlink()
-            report_progress("  - Removed 'manifest.sig'.")
-
-        # 5. Write the updated manifest
-        with open(manifest_path, 'w') as f:
-            yaml.dump(manifest, f, sort_keys=False)
-
-        # 6. Repack the bundle
-        report_progress("  - Repackaging the bundle...")
-        with zipfile.ZipFile(bundle_path, 'w', zipfile.ZIP_DEFLATED) as bundle_zip:
-            for file_path in staging_dir.rglob('*'):
-                if file_path.is_file():
-                    bundle_zip.write(file_path, file_path.relative_to(staging_dir))
-        
-        report_progress(f"\n✅ Bundle '{bundle_path.name}' has been cleared of all binaries.")
-
-    finally:
-        if staging_dir.exists():
-            shutil.rmtree(staging_dir)
+    # 2. Clear binaries and signatures from manifest
+    report_progress("  - Clearing binary and signature information from manifest...")
+    manifest.pop('bundleSignature', None)
+    
+    for plugin_name, plugin_data in manifest.get('bundlePlugins', {}).items():
+        if 'binaries' in plugin_data:
+            report_progress(f"    - Clearing binaries for plugin '{plugin_name}'")
+            plugin_data['binaries'] = []
+    
+    # 3. Drop the binaries directory and signature file from the archive
+    replacements = {}
+    binary_members = [name for name in member_names if name.startswith("bin/")]
+    if binary_members:
+        replacements.update(dict.fromkeys(binary_members))
+        report_progress("  - Removed 'bin/' directory.")
+
+    if "manifest.sig" in member_names:
+        replacements["manifest.sig"] = None
+        report_progress("  - Removed 'manifest.sig'.")
+
+    # 4. Repack the bundle with the updated manifest
+    report_progress("  - Repackaging the bundle...")
+    replacements["manifest.yaml"] = dump_yaml(manifest, sort_keys=False)
+    _rewrite_bundle(bundle_path, replacements)
+    
+    report_progress(f"\n✅ Bundle '{bundle_path.name}' has been cleared of all binaries.")
 
 def diff_bundle(bundle_a_path: Path, bundle_b_path: Path, progress_callback=None):
     """
@@ -799,19 +993,15 @@ def diff_bundle(bundle_a_path: Path, bundle_b_path: Path, progress_callback=None
     }
 
     report_progress(f"Comparing {bundle_a_path.name} and {bundle_b_path.name}")
-    with tempfile.TemporaryDirectory() as temp_a_str, tempfile.TemporaryDirectory() as temp_b_str:
-        temp_a = Path(temp_a_str)
-        temp_b = Path(temp_b_str)
-
-        report_progress("  - Unpacking bundles...")
-        with zipfile.ZipFile(bundle_a_path, 'r') as z: z.extractall(temp_a)
-        with zipfile.ZipFile(bundle_b_path, 'r') as z: z.extractall(temp_b)
+    # Only the manifests and signature files are compared, so nothing else is unpacked
+    report_progress("  - Reading bundle manifests...")
+    with zipfile.ZipFile(bundle_a_path, 'r') as bundle_a_zip, zipfile.ZipFile(bundle_b_path, 'r') as bundle_b_zip:
+        members_a = set(bundle_a_zip.namelist())
+        members_b = set(bundle_b_zip.namelist())
 
         # 1. Compare Signatures
-        sig_a_path = temp_a / "manifest.sig"
-        sig_b_path = temp_b / "manifest.sig"
-        sig_a = sig_a_path.read_bytes() if sig_a_path.exists() else None
-        sig_b = sig_b_path.read_bytes() if sig_b_path.exists() else None
+        sig_a = bundle_a_zip.read("manifest.sig") if "manifest.sig" in members_a else None
+        sig_b = bundle_b_zip.read("manifest.sig") if "manifest.sig" in members_b else None
 
         if sig_a == sig_b and sig_a is not None:
             results['signature']['status'] = 'UNCHANGED'
@@ -825,8 +1015,8 @@ def diff_bundle(bundle_a_path: Path, bundle_b_path: Path, progress_callback=None
             results['signature']['status'] = 'UNSIGNED'
 
         # 2. Compare Manifests
-        manifest_a_content = (temp_a / "manifest.yaml").read_text()
-        manifest_b_content = (temp_b / "manifest.yaml").read_text()
+        manifest_a_content = bundle_a_zip.read("manifest.yaml").decode('utf-8')
+        manifest_b_content = bundle_b_zip.read("manifest.yaml").decode('utf-8')
         
         if manifest_a_content != manifest_b_content:
             import difflib
@@ -841,8 +1031,8 @@ def diff_bundle(bundle_a_path: Path, bundle_b_path: Path, progress_callback=None
             results['manifest']['diff'] = []
 
         # 3. Compare File Contents (via checksums in manifest)
-        manifest_a = yaml.safe_load(manifest_a_content)
-        manifest_b = yaml.safe_load(manifest_b_content)
+        manifest_a = load_yaml(manifest_a_content)
+        manifest_b = load_yaml(manifest_b_content)
 
         def get_files_from_manifest(manifest):
             files = {}
@@ -876,6 +1066,30 @@ def diff_bundle(bundle_a_path: Path, bundle_b_path: Path, progress_callback=None
 
     return results
 
+def read_bundle_manifest(bundle_path: Path) -> dict:
+    """
+    Reads manifest.yaml straight out of a bundle, without unpacking the rest of it.
+
+    The parsed manifest is reused while the bundle file is unchanged (same mtime and
+    size), so repeated lookups in one session only parse it once.
+
+    Returns:
+        A copy of the parsed manifest, safe for the caller to modify.
+    """
+    bundle_path = Path(bundle_path).resolve()
+    st = bundle_path.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _manifest_cache.get(bundle_path)
+    if cached is None or cached[0] != stamp:
+        with zipfile.ZipFile(bundle_path, 'r') as bundle_zip:
+            try:
+                manifest_content = bundle_zip.read("manifest.yaml")
+            except KeyError:
+                raise FileNotFoundError("Bundle is invalid. Missing manifest.yaml.")
+        cached = (stamp, load_yaml(manifest_content) or {})
+        _manifest_cache[bundle_path] = cached
+    return copy.deepcopy(cached[1])
+
 def get_fillable_targets(bundle_path: Path) -> Dict[str, Any]:
     """
     Inspects a bundle and determines which plugins are missing binaries for available build targets.
@@ -899,35 +1113,24 @@ def get_fillable_targets(bundle_path: Path) -> Dict[str, Any]:
         }
     """
     try:
-        staging_dir = Path(tempfile.mkdtemp(prefix="fourdst_fillable_"))
-        try:
-            with zipfile.ZipFile(bundle_path, 'r') as bundle_zip:
-                bundle_zip.extractall(staging_dir)
-            
-            manifest_path = staging_dir / "manifest.yaml"
-            with open(manifest_path, 'r') as f:
-                manifest = yaml.safe_load(f) or {}
-            
-            available_targets = get_available_build_targets()
-            result = {}
-            
-            for plugin_name, plugin_data in manifest.get('bundlePlugins', {}).items():
-                existing_targets = set()
-                for binary in plugin_data.get('binaries', []):
-                    platform_info = binary.get('platform', {})
-                    existing_targets.add(platform_info.get('triplet', 'unknown'))
-                
-                fillable = [target for target in available_targets if target['triplet'] not in existing_targets]
-                if fillable:
-                    result[plugin_name] = fillable
+        manifest = read_bundle_manifest(bundle_path)
+        available_targets = get_available_build_targets()
+        result = {}
+        
+        for plugin_name, plugin_data in manifest.get('bundlePlugins', {}).items():
+            existing_targets = set()
+            for binary in plugin_data.get('binaries', []):
+                platform_info = binary.get('platform', {})
+                existing_targets.add(platform_info.get('triplet', 'unknown'))
             
-            return {
-                'success': True,
-                'data': result
-            }
-        finally:
-            if staging_dir.exists():
-                shutil.rmtree(staging_dir)
+            fillable = [target for target in available_targets if target['triplet'] not in existing_targets]
+            if fillable:
+                result[plugin_name] = fillable
+        
+        return {
+            'success': True,
+            'data': result
+        }
     except Exception as e:
         logging.exception(f"Unexpected error getting fillable targets for {bundle_path}")
         return {
@@ -935,7 +1138,49 @@ def get_fillable_targets(bundle_path: Path) -> Dict[str, Any]:
             'error': f"Unexpected error: {str(e)}"
         }
 
-def fill_bundle(bundle_path: Path, targets_to_build: dict, progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+def _build_and_stage_target(
+    plugin_name: str,
+    sdist_path: Path,
+    target: dict,
+    staging_dir: Path,
+    binaries_dir: Path,
+    progress_callback: Optional[Callable] = None
+) -> tuple[str, dict]:
+    """
+    Builds one plugin for one target and copies the binary into binaries_dir.
+
+    Returns:
+        (tagged filename, manifest entry for the new binary)
+    """
+    # Build directories are kept between fills so that rebuilds are incremental
+    build_dir = get_target_build_dir(plugin_name, target)
+    build_dir.mkdir(parents=True, exist_ok=True)
+
+    if target['type'] == 'docker':
+        compiled_lib, final_target = build_plugin_in_docker(
+            sdist_path, build_dir, target, plugin_name, progress_callback
+        )
+    else: # native or cross
+        compiled_lib, final_target = build_plugin_for_target(
+            sdist_path, build_dir, target, progress_callback
+        )
+
+    # Stage the new binary
+    base_name = compiled_lib.stem
+    ext = compiled_lib.suffix
+    tagged_filename = f"{base_name}.{final_target['triplet']}.{final_target['abi_signature']}{ext}"
+    staged_lib_path = binaries_dir / tagged_filename
+    shutil.copy(compiled_lib, staged_lib_path)
+
+    return tagged_filename, {
+        'platform': final_target,
+        'path': staged_lib_path.relative_to(staging_dir).as_posix(),
+        'compiledOn': datetime.datetime.now().isoformat(),
+        'checksum': "sha256:" + calculate_sha256(staged_lib_path)
+    }
+
+def fill_bundle(bundle_path: Path, targets_to_build: dict, progress_callback: Optional[Callable] = None,
+                max_docker_jobs: int = MAX_PARALLEL_DOCKER_BUILDS) -> Dict[str, Any]:
     """
     Fills a bundle with newly compiled binaries for the specified targets.
 
@@ -965,6 +1210,8 @@ def fill_bundle(bundle_path: Path, targets_to_build: dict, progress_callback: Op
         bundle_path: Path to the .fbundle file.
         targets_to_build: A dictionary like {'plugin_name': [target1, target2]} specifying what to build.
         progress_callback: An optional function to report progress.
+        max_docker_jobs: How many Docker builds may run at once. They run in their own
+            pool, next to up to MAX_PARALLEL_BUILDS native and cross builds.
     """
     def report_progress(message) -> None:
         if progress_callback:
@@ -976,59 +1223,50 @@ def fill_bundle(bundle_path: Path, targets_to_build: dict, progress_callback: Op
     successful_builds = 0
     failed_builds = 0
     build_details = []
+    staged_binaries = {}
     
     try:
-        report_progress("Unpacking bundle to temporary directory...")
+        # Only the sources of the plugins being built are needed on disk; everything
+        # else is copied over to the new bundle as is
+        report_progress("Unpacking plugin sources to temporary directory...")
         with zipfile.ZipFile(bundle_path, 'r') as bundle_zip:
-            bundle_zip.extractall(staging_dir)
-
-        manifest_path = staging_dir / "manifest.yaml"
-        with open(manifest_path, 'r') as f:
-            manifest = yaml.safe_load(f)
+            manifest = load_yaml(bundle_zip.read("manifest.yaml"))
+            for plugin_name in targets_to_build:
+                bundle_zip.extract(manifest['bundlePlugins'][plugin_name]['sdist']['path'], staging_dir)
 
         binaries_dir = staging_dir / "bin"
         binaries_dir.mkdir(exist_ok=True)
 
-        for plugin_name, targets in targets_to_build.items():
-            report_progress(f"Processing plugin: {plugin_name}")
-            plugin_info = manifest['bundlePlugins'][plugin_name]
-            sdist_path = staging_dir / plugin_info['sdist']['path']
-
-            for target in targets:
-                target_triplet = target['triplet']
-                report_progress({
-                    'status': 'building',
-                    'plugin': plugin_name,
-                    'target': target_triplet,
-                    'message': f"Building {plugin_name} for {target_triplet}..."
-                })
-                build_dir = Path(tempfile.mkdtemp(prefix=f"{plugin_name}_build_"))
+        # Each (plugin, target) build has its own build directory, so they run concurrently.
+        # Docker builds mostly wait on the daemon, so they don't take the slots of local
+        # builds and are throttled separately. The manifest is only touched here, in
+        # submission order, once a build finishes.
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_BUILDS) as executor, \
+             ThreadPoolExecutor(max_workers=max(1, max_docker_jobs)) as docker_executor:
+            pending_builds = []
+            for plugin_name, targets in targets_to_build.items():
+                report_progress(f"Processing plugin: {plugin_name}")
+                plugin_info = manifest['bundlePlugins'][plugin_name]
+                sdist_path = staging_dir / plugin_info['sdist']['path']
+
+                for target in targets:
+                    report_progress({
+                        'status': 'building',
+                        'plugin': plugin_name,
+                        'target': target['triplet'],
+                        'message': f"Building {plugin_name} for {target['triplet']}..."
+                    })
+                    target_executor = docker_executor if target['type'] == 'docker' else executor
+                    future = target_executor.submit(
+                        _build_and_stage_target, plugin_name, sdist_path, target, staging_dir, binaries_dir, progress_callback
+                    )
+                    pending_builds.append((plugin_name, target['triplet'], future))
 
+            for plugin_name, target_triplet, future in pending_builds:
                 try:
-                    if target['type'] == 'docker':
-                        compiled_lib, final_target = build_plugin_in_docker(
-                            sdist_path, build_dir, target, plugin_name, progress_callback
-                        )
-                    else: # native or cross
-                        compiled_lib, final_target = build_plugin_for_target(
-                            sdist_path, build_dir, target, progress_callback
-                        )
-
-                    # Stage the new binary
-                    base_name = compiled_lib.stem
-                    ext = compiled_lib.suffix
-                    tagged_filename = f"{base_name}.{final_target['triplet']}.{final_target['abi_signature']}{ext}"
-                    staged_lib_path = binaries_dir / tagged_filename
-                    shutil.copy(compiled_lib, staged_lib_path)
-                    
-                    # Update manifest
-                    new_binary_entry = {
-                        'platform': final_target,
-                        'path': staged_lib_path.relative_to(staging_dir).as_posix(),
-                        'compiledOn': datetime.datetime.now().isoformat(),
-                        'checksum': "sha256:" + calculate_sha256(staged_lib_path)
-                    }
-                    plugin_info.setdefault('binaries', []).append(new_binary_entry)
+                    tagged_filename, new_binary_entry = future.result()
+                    manifest['bundlePlugins'][plugin_name].setdefault('binaries', []).append(new_binary_entry)
+                    staged_binaries[new_binary_entry['path']] = staging_dir / new_binary_entry['path']
 
                     successful_builds += 1
                     build_details.append({
@@ -1060,20 +1298,10 @@ def fill_bundle(bundle_path: Path, targets_to_build: dict, progress_callback: Op
                         'target': target_triplet,
                         'message': f"Failed to build {plugin_name} for {target_triplet}: {e}"
                     })
-                finally:
-                    if build_dir.exists():
-                        shutil.rmtree(build_dir)
-
-        # Write the updated manifest
-        with open(manifest_path, 'w') as f:
-            yaml.dump(manifest, f, sort_keys=False)
 
-        # Repack the bundle
+        # Repack the bundle with the new binaries and the updated manifest
         report_progress(f"Repackaging bundle: {bundle_path.name}")
-        with zipfile.ZipFile(bundle_path, 'w', zipfile.ZIP_DEFLATED) as bundle_zip:
-            for file_path in staging_dir.rglob('*'):
-                if file_path.is_file():
-                    bundle_zip.write(file_path, file_path.relative_to(staging_dir))
+        _rewrite_bundle(bundle_path, {**staged_binaries, "manifest.yaml": dump_yaml(manifest, sort_keys=False)})
 
         report_progress({"status": "complete", "message": "✅ Bundle filled successfully!"})
         
@@ -7,6 +7,17 @@ LOCAL_TRUST_STORE_PATH = FOURDST_CONFIG_DIR / "keys"
 CROSS_FILES_PATH = FOURDST_CONFIG_DIR / "cross"
 CACHE_PATH = FOURDST_CONFIG_DIR / "cache"
 ABI_CACHE_FILE = CACHE_PATH / "abi_identifier.json"
+ABI_DETECTOR_BIN_PATH = CACHE_PATH / "abi_detector_bin"
+DOCKER_ABI_CACHE_PATH = CACHE_PATH / "docker_abi"
+BUILD_CACHE_PATH = CACHE_PATH / "builds"
+DOCKER_CCACHE_PATH = CACHE_PATH / "docker_ccache"
+CLANG_AST_CACHE_PATH = CACHE_PATH / "clang_ast"
+# Bundles mostly hold already dense shared libraries, where higher deflate levels cost
+# a lot of time for very little size
+BUNDLE_ZIP_COMPRESSLEVEL = 1
+# Archive members with these suffixes are already compressed (or, for shared libraries,
+# deflate poorly enough), so they are stored rather than deflated again
+PRECOMPRESSED_SUFFIXES = {'.so', '.dylib', '.dll', '.zip', '.whl', '.gz', '.xz', '.bz2', '.zst', '.png', '.jpg'}
 DOCKER_BUILD_IMAGES = {
     "x86_64 (manylinux_2_28)": "quay.io/pypa/manylinux_2_28_x86_64",
     "aarch64 (manylinux_2_28)": "quay.io/pypa/manylinux_2_28_aarch64",
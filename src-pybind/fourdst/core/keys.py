@@ -16,19 +16,19 @@ ARCHITECTURE:
 
 import os
 import sys
-import json
+import copy
+import atexit
 import shutil
 import hashlib
 import logging
+import tarfile
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, Optional, Callable, List
 
-from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
-from cryptography.hazmat.primitives import serialization
-
-from fourdst.core.config import FOURDST_CONFIG_DIR, LOCAL_TRUST_STORE_PATH
-from fourdst.core.utils import run_command
+from fourdst.core.config import FOURDST_CONFIG_DIR, LOCAL_TRUST_STORE_PATH, CACHE_PATH
+from fourdst.core.utils import run_command, read_json, write_json, calculate_sha256
 
 # Configure logging to go to stderr only, never stdout
 logging.basicConfig(stream=sys.stderr, level=logging.INFO)
@@ -37,6 +37,27 @@ logging.basicConfig(stream=sys.stderr, level=logging.INFO)
 MANUAL_KEYS_DIR = LOCAL_TRUST_STORE_PATH / "manual"
 REMOTES_DIR = LOCAL_TRUST_STORE_PATH / "remotes"
 KEY_REMOTES_CONFIG = FOURDST_CONFIG_DIR / "key_remotes.json"
+KEY_FINGERPRINT_INDEX = CACHE_PATH / "key_fingerprints.json"
+
+# File name suffixes of public keys in the trust store
+PUB_KEY_SUFFIX = ".pub"
+KEY_FILE_SUFFIXES = (PUB_KEY_SUFFIX, ".pub.pem")
+
+# git's smart HTTP transport has no upload-archive, so these remotes are always cloned
+ARCHIVE_UNSUPPORTED_URL_PREFIXES = ("http://", "https://")
+
+# Upper bound on concurrent git operations during sync_remotes
+MAX_SYNC_WORKERS = 8
+
+# Upper bound on keys hashed concurrently by list_keys
+MAX_FINGERPRINT_WORKERS = 8
+
+# Fingerprints of trust store keys, keyed by path and validated against (mtime_ns, size)
+_fingerprint_index: Optional[Dict[str, Dict[str, Any]]] = None
+_fingerprint_index_dirty = False
+
+# Parsed remotes configs, keyed by path and validated against (st_mtime_ns, st_size)
+_remotes_config_cache: Dict[Path, tuple] = {}
 
 
 def list_keys(progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
@@ -86,28 +107,26 @@ def list_keys(progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
         keys_by_source = {}
         total_count = 0
 
-        for source_dir in LOCAL_TRUST_STORE_PATH.iterdir():
-            if source_dir.is_dir():
-                source_keys = []
-                # Look for both .pub and .pub.pem files
-                key_patterns = ["*.pub", "*.pub.pem"]
-                for pattern in key_patterns:
-                    for key_file in source_dir.glob(pattern):
-                        try:
-                            fingerprint = _get_key_fingerprint(key_file)
-                            key_info = {
-                                "name": key_file.name,
-                                "path": str(key_file),
-                                "fingerprint": fingerprint,
-                                "size_bytes": key_file.stat().st_size
-                            }
-                            source_keys.append(key_info)
-                            total_count += 1
-                        except Exception as e:
-                            report_progress(f"Warning: Could not process key {key_file}: {e}")
-
-                if source_keys:
-                    keys_by_source[source_dir.name] = source_keys
+        key_entries = list(_scan_trust_store_keys())
+
+        # Keys missing from the fingerprint index are hashed concurrently; hashlib
+        # releases the GIL while digesting, so the threads genuinely overlap
+        _load_fingerprint_index()
+        with ThreadPoolExecutor(max_workers=min(MAX_FINGERPRINT_WORKERS, len(key_entries) or 1)) as executor:
+            fingerprint_results = list(executor.map(_fingerprint_key_entry, (entry for _, entry in key_entries)))
+
+        for (source_name, key_entry), (key_stat, fingerprint, error) in zip(key_entries, fingerprint_results):
+            if error is not None:
+                report_progress(f"Warning: Could not process key {key_entry.path}: {error}")
+                continue
+            key_info = {
+                "name": key_entry.name,
+                "path": key_entry.path,
+                "fingerprint": fingerprint,
+                "size_bytes": key_stat.st_size
+            }
+            keys_by_source.setdefault(source_name, []).append(key_info)
+            total_count += 1
 
         report_progress(f"Found {total_count} keys across {len(keys_by_source)} sources")
         
@@ -163,6 +182,10 @@ def generate_key(
         else:
             logging.info(message)
 
+    # cryptography loads OpenSSL bindings, so only pay for it when generating keys
+    from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+    from cryptography.hazmat.primitives import serialization
+
     try:
         if output_dir is None:
             output_dir = Path.cwd()
@@ -297,10 +320,12 @@ def add_key(
         
         destination = MANUAL_KEYS_DIR / key_path.name
         already_existed = False
+        # Keys are tiny: read once, then compare, write and fingerprint from memory
+        key_bytes = key_path.read_bytes()
 
         if destination.exists():
             # Check if content is identical
-            if destination.read_bytes() == key_path.read_bytes():
+            if destination.read_bytes() == key_bytes:
                 already_existed = True
                 report_progress(f"Key '{key_path.name}' already exists with identical content")
             else:
@@ -310,10 +335,10 @@ def add_key(
                 }
         else:
             report_progress(f"Adding key '{key_path.name}' to trust store...")
-            shutil.copy(key_path, destination)
+            destination.write_bytes(key_bytes)
 
         # Generate fingerprint
-        fingerprint = _get_key_fingerprint(destination)
+        fingerprint = "sha256:" + hashlib.sha256(key_bytes).hexdigest()
 
         return {
             "success": True,
@@ -334,14 +359,20 @@ def add_key(
 
 def remove_key(
     key_identifier: str,
-    progress_callback: Optional[Callable] = None
+    progress_callback: Optional[Callable] = None,
+    remove_all: bool = False
 ) -> Dict[str, Any]:
     """
     Removes a key from the trust store by fingerprint, name, or path.
+
+    A path inside the trust store removes exactly that file. A path to a key file
+    elsewhere is matched by content, and the scan stops at the first trust store
+    key with the same content unless remove_all is set.
     
     Args:
         key_identifier: Key fingerprint, name, or path to identify the key to remove
         progress_callback: Optional function for progress updates
+        remove_all: Remove every copy of a key given by an outside path instead of only the first
     
     Returns:
         Dict with structure:
@@ -377,35 +408,45 @@ def remove_key(
             }
 
         removed_keys = []
+
+        # A path to a key file outside the trust store is matched by content, so hash it only once up front
+        target_fingerprint = None
+        identifier_realpath = None
+        identifier_path = Path(key_identifier)
+        if identifier_path.is_file():
+            identifier_realpath = os.path.realpath(identifier_path)
+            if not Path(identifier_realpath).is_relative_to(os.path.realpath(LOCAL_TRUST_STORE_PATH)):
+                target_fingerprint = _get_key_fingerprint(identifier_path)
         
         # Search for matching keys (same patterns as list_keys)
-        for source_dir in LOCAL_TRUST_STORE_PATH.iterdir():
-            if source_dir.is_dir():
-                key_patterns = ["*.pub", "*.pub.pem"]
-                for pattern in key_patterns:
-                    for key_file in source_dir.glob(pattern):
-                        should_remove = False
-                        
-                        # Check if identifier matches fingerprint, name, or path
-                        try:
-                            fingerprint = _get_key_fingerprint(key_file)
-                            if (key_identifier == fingerprint or 
-                                key_identifier == key_file.name or 
-                                key_identifier == str(key_file) or
-                                key_identifier == str(key_file.resolve())):
-                                should_remove = True
-                        except Exception as e:
-                            report_progress(f"Warning: Could not process key {key_file}: {e}")
-                            continue
-                        
-                        if should_remove:
-                            report_progress(f"Removing key '{key_file.name}' from source '{source_dir.name}'")
-                            removed_keys.append({
-                                "name": key_file.name,
-                                "path": str(key_file),
-                                "source": source_dir.name
-                            })
-                            key_file.unlink()
+        for source_name, key_entry in _scan_trust_store_keys():
+            should_remove = False
+            
+            # Check if identifier matches fingerprint, name, or path
+            try:
+                fingerprint = _get_indexed_key_fingerprint(Path(key_entry.path), key_entry.stat())
+                if (key_identifier == fingerprint or 
+                    fingerprint == target_fingerprint or
+                    key_identifier == key_entry.name or 
+                    key_identifier == key_entry.path or
+                    identifier_realpath == os.path.realpath(key_entry.path)):
+                    should_remove = True
+            except Exception as e:
+                report_progress(f"Warning: Could not process key {key_entry.path}: {e}")
+                continue
+            
+            if should_remove:
+                key_file = Path(key_entry.path)
+                report_progress(f"Removing key '{key_entry.name}' from source '{source_name}'")
+                removed_keys.append({
+                    "name": key_entry.name,
+                    "path": key_entry.path,
+                    "source": source_name
+                })
+                key_file.unlink()
+                _forget_key_fingerprint(key_file)
+                if target_fingerprint is not None and not remove_all:
+                    break
 
         if not removed_keys:
             return {
@@ -467,8 +508,7 @@ def sync_remotes(progress_callback: Optional[Callable] = None) -> Dict[str, Any]
                 "error": "No remotes configured. Use remote management to add remotes first."
             }
 
-        with open(KEY_REMOTES_CONFIG, 'r') as f:
-            config = json.load(f)
+        config = _load_remotes_config()
         
         remotes = config.get("remotes", [])
         if not remotes:
@@ -483,27 +523,23 @@ def sync_remotes(progress_callback: Optional[Callable] = None) -> Dict[str, Any]
         remotes_to_remove = []
         total_keys_synced = 0
 
+        for remote in remotes:
+            report_progress(f"Syncing remote '{remote['name']}' from {remote['url']}")
+
+        # Each remote is an independent, network-bound git operation, so run them
+        # concurrently and report the outcomes from this thread in config order
+        with ThreadPoolExecutor(max_workers=min(MAX_SYNC_WORKERS, len(remotes))) as executor:
+            futures = {
+                remote['name']: executor.submit(_sync_remote, remote['url'], REMOTES_DIR / remote['name'])
+                for remote in remotes
+            }
+
         for remote in remotes:
             name = remote['name']
             url = remote['url']
-            remote_path = REMOTES_DIR / name
-            
-            report_progress(f"Syncing remote '{name}' from {url}")
             
             try:
-                if remote_path.exists():
-                    run_command(["git", "pull"], cwd=remote_path)
-                else:
-                    run_command(["git", "clone", "--depth", "1", url, str(remote_path)])
-                
-                # Clean up non-public key files and count keys
-                keys_count = 0
-                for item in remote_path.rglob("*"):
-                    if item.is_file():
-                        if item.suffix == '.pub':
-                            keys_count += 1
-                        else:
-                            item.unlink()
+                keys_count = futures[name].result()
                 
                 total_keys_synced += keys_count
                 
@@ -529,9 +565,9 @@ def sync_remotes(progress_callback: Optional[Callable] = None) -> Dict[str, Any]
 
         # Remove failed remotes from config if any
         if remotes_to_remove:
-            config['remotes'] = [r for r in config['remotes'] if r['name'] not in remotes_to_remove]
-            with open(KEY_REMOTES_CONFIG, 'w') as f:
-                json.dump(config, f, indent=2)
+            failed_names = set(remotes_to_remove)
+            config['remotes'] = [r for r in config['remotes'] if r['name'] not in failed_names]
+            _save_remotes_config(config)
 
         success_count = len([r for r in synced_remotes if r["status"] == "success"])
         
@@ -578,13 +614,12 @@ def get_remote_sources(progress_callback: Optional[Callable] = None) -> Dict[str
                 "message": "No remotes configured"
             }
 
-        with open(KEY_REMOTES_CONFIG, 'r') as f:
-            config = json.load(f)
+        config = _load_remotes_config()
         
         remotes_info = []
         for remote in config.get("remotes", []):
             remote_path = REMOTES_DIR / remote['name']
-            keys_count = len(list(remote_path.glob("*.pub"))) if remote_path.exists() else 0
+            keys_count = _count_key_files(str(remote_path)) if remote_path.exists() else 0
             
             remotes_info.append({
                 "name": remote['name'],
@@ -635,8 +670,7 @@ def add_remote_source(
         # Load existing config or create new one
         config = {"remotes": []}
         if KEY_REMOTES_CONFIG.exists():
-            with open(KEY_REMOTES_CONFIG, 'r') as f:
-                config = json.load(f)
+            config = _load_remotes_config()
 
         # Check if remote already exists
         for remote in config.get("remotes", []):
@@ -653,8 +687,7 @@ def add_remote_source(
         })
 
         # Save config
-        with open(KEY_REMOTES_CONFIG, 'w') as f:
-            json.dump(config, f, indent=2)
+        _save_remotes_config(config)
 
         return {
             "success": True,
@@ -697,8 +730,7 @@ def remove_remote_source(
                 "error": "No remotes configured"
             }
 
-        with open(KEY_REMOTES_CONFIG, 'r') as f:
-            config = json.load(f)
+        config = _load_remotes_config()
 
         original_len = len(config.get("remotes", []))
         config["remotes"] = [r for r in config.get("remotes", []) if r['name'] != name]
@@ -710,8 +742,7 @@ def remove_remote_source(
             }
 
         # Save updated config
-        with open(KEY_REMOTES_CONFIG, 'w') as f:
-            json.dump(config, f, indent=2)
+        _save_remotes_config(config)
 
         # Remove local directory if it exists
         remote_path = REMOTES_DIR / name
@@ -732,6 +763,159 @@ def remove_remote_source(
         }
 
 
+def _sync_remote(url: str, remote_path: Path) -> int:
+    """
+    Fetches a single remote and strips everything except public keys.
+
+    Remotes that support `git archive --remote` get just their keys exported; others
+    are kept as a sparse, blobless clone that later syncs pull into.
+
+    Returns:
+        Number of *.pub keys in the synced remote
+    """
+    # Never block on a credential prompt, and skip housekeeping that dominates small pulls
+    env = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+    git = ["git", "-c", "gc.auto=0", "-c", "core.fsmonitor=false"]
+
+    if (remote_path / ".git").exists():
+        run_command(git + ["pull"], cwd=remote_path, env=env)
+    elif not url.startswith(ARCHIVE_UNSUPPORTED_URL_PREFIXES) and _archive_remote_keys(url, remote_path, env):
+        return _count_key_files_recursive(str(remote_path))
+    else:
+        if remote_path.exists():
+            shutil.rmtree(remote_path)
+        # A blobless partial clone stays cheap to update, unlike a shallow one, and the
+        # sparse checkout means only public key blobs are ever fetched and written
+        run_command(git + ["clone", "--filter=blob:none", "--no-checkout", url, str(remote_path)], env=env)
+        run_command(git + ["config", "core.sparseCheckout", "true"], cwd=remote_path, env=env)
+        sparse_checkout_file = remote_path / ".git" / "info" / "sparse-checkout"
+        sparse_checkout_file.parent.mkdir(parents=True, exist_ok=True)
+        sparse_checkout_file.write_text(f"*{PUB_KEY_SUFFIX}\n")
+        run_command(git + ["checkout"], cwd=remote_path, env=env)
+
+    # Clean up anything the sparse checkout let through (and older full checkouts) and count keys
+    return _prune_non_key_files(str(remote_path))
+
+
+def _archive_remote_keys(url: str, remote_path: Path, env: Dict[str, str]) -> bool:
+    """
+    Fetches only the *.pub files of a remote with `git archive --remote`, streaming the
+    tar output so no .git directory or non-key file ever touches the disk.
+
+    The keys are unpacked next to remote_path and swapped in once complete.
+
+    Returns:
+        False if the server does not allow upload-archive (the caller then clones)
+    """
+    staging_path = remote_path.with_name(f".{remote_path.name}.archive")
+    if staging_path.exists():
+        shutil.rmtree(staging_path)
+    staging_path.mkdir(parents=True)
+
+    try:
+        with subprocess.Popen(
+            ["git", "archive", "--format=tar", f"--remote={url}", "HEAD"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            stdin=subprocess.DEVNULL,
+            env=env
+        ) as process:
+            try:
+                with tarfile.open(fileobj=process.stdout, mode="r|") as tar:
+                    for member in tar:
+                        # Regular files only: links and devices from a remote are never trusted
+                        if not (member.isreg() and member.name.endswith(PUB_KEY_SUFFIX)):
+                            continue
+                        relative_path = Path(member.name)
+                        if relative_path.is_absolute() or ".." in relative_path.parts:
+                            continue
+                        destination = staging_path / relative_path
+                        destination.parent.mkdir(parents=True, exist_ok=True)
+                        with tar.extractfile(member) as src, open(destination, "wb") as dst:
+                            shutil.copyfileobj(src, dst)
+                archive_complete = True
+            except tarfile.TarError:
+                # Typically an empty stream because the server refused the archive
+                archive_complete = False
+                process.kill()
+        if not archive_complete or process.returncode != 0:
+            shutil.rmtree(staging_path)
+            return False
+
+        if remote_path.exists():
+            shutil.rmtree(remote_path)
+        staging_path.rename(remote_path)
+        return True
+    except BaseException:
+        if staging_path.exists():
+            shutil.rmtree(staging_path)
+        raise
+
+
+def _count_key_files_recursive(directory: str) -> int:
+    """Counts the *.pub files below a directory."""
+    keys_count = 0
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                keys_count += _count_key_files_recursive(entry.path)
+            elif entry.name.endswith(PUB_KEY_SUFFIX) and entry.is_file(follow_symlinks=False):
+                keys_count += 1
+    return keys_count
+
+
+def _scan_trust_store_keys():
+    """
+    Yields (source_name, DirEntry) for every public key in the trust store.
+
+    Uses os.scandir so that file type checks come from the directory listing
+    rather than a stat() per entry.
+    """
+    key_suffixes = KEY_FILE_SUFFIXES
+    with os.scandir(LOCAL_TRUST_STORE_PATH) as sources:
+        for source_entry in sources:
+            if not source_entry.is_dir(follow_symlinks=False):
+                continue
+            source_name = source_entry.name
+            with os.scandir(source_entry.path) as entries:
+                for entry in entries:
+                    if entry.name.endswith(key_suffixes) and entry.is_file(follow_symlinks=False):
+                        yield source_name, entry
+
+
+def _count_key_files(directory: str) -> int:
+    """Counts the *.pub files directly inside a directory."""
+    with os.scandir(directory) as entries:
+        return sum(1 for entry in entries if entry.name.endswith(PUB_KEY_SUFFIX) and entry.is_file(follow_symlinks=False))
+
+
+def _prune_non_key_files(directory: str) -> int:
+    """
+    Deletes every file that is not a *.pub key below a synced remote checkout.
+
+    The .git directory is skipped by name before anything else is looked at, so
+    the next sync can still pull. Symlinks are always removed: a remote must not
+    be able to plant a "key" that points at an arbitrary local file.
+
+    Returns:
+        Number of *.pub keys kept
+    """
+    keys_count = 0
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name == ".git":
+                continue
+            if entry.is_symlink():
+                os.unlink(entry.path)
+            elif entry.is_dir(follow_symlinks=False):
+                keys_count += _prune_non_key_files(entry.path)
+            elif not entry.name.endswith(PUB_KEY_SUFFIX):
+                os.unlink(entry.path)
+            else:
+                keys_count += 1
+    return keys_count
+
+
 def _get_key_fingerprint(key_path: Path) -> str:
     """
     Generates a SHA256 fingerprint for a public key.
@@ -742,5 +926,101 @@ def _get_key_fingerprint(key_path: Path) -> str:
     Returns:
         SHA256 fingerprint in format "sha256:hexdigest"
     """
-    pub_key_bytes = key_path.read_bytes()
-    return "sha256:" + hashlib.sha256(pub_key_bytes).hexdigest()
+    return "sha256:" + calculate_sha256(key_path)
+
+
+def _load_fingerprint_index() -> Dict[str, Dict[str, Any]]:
+    """Loads the persistent key fingerprint index, scheduling it to be written back at exit."""
+    global _fingerprint_index
+    if _fingerprint_index is None:
+        try:
+            _fingerprint_index = read_json(KEY_FINGERPRINT_INDEX)
+        except (OSError, ValueError):
+            _fingerprint_index = {}
+        atexit.register(_save_fingerprint_index)
+    return _fingerprint_index
+
+
+def _save_fingerprint_index() -> None:
+    """Writes the key fingerprint index back to the cache if it changed."""
+    global _fingerprint_index_dirty
+    if not _fingerprint_index_dirty:
+        return
+    try:
+        CACHE_PATH.mkdir(parents=True, exist_ok=True)
+        write_json(KEY_FINGERPRINT_INDEX, _fingerprint_index)
+        _fingerprint_index_dirty = False
+    except OSError as e:
+        logging.warning(f"Could not write key fingerprint index: {e}")
+
+
+def _get_indexed_key_fingerprint(key_path: Path, st: Optional[os.stat_result] = None) -> str:
+    """
+    Gets the fingerprint of a trust store key, only re-hashing it when it changed on disk.
+    
+    Args:
+        key_path: Path to the public key file
+        st: Stat result for key_path if the caller already has one
+        
+    Returns:
+        SHA256 fingerprint in format "sha256:hexdigest"
+    """
+    global _fingerprint_index_dirty
+    index = _load_fingerprint_index()
+    if st is None:
+        st = key_path.stat()
+    entry = index.get(str(key_path))
+    if entry and entry.get("mtime_ns") == st.st_mtime_ns and entry.get("size") == st.st_size:
+        return entry["fingerprint"]
+
+    fingerprint = _get_key_fingerprint(key_path)
+    index[str(key_path)] = {
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "fingerprint": fingerprint
+    }
+    _fingerprint_index_dirty = True
+    return fingerprint
+
+
+def _fingerprint_key_entry(key_entry: os.DirEntry):
+    """
+    Fingerprints a trust store key for list_keys.
+
+    Returns:
+        (stat_result, fingerprint, None) on success or (None, None, exception) on failure
+    """
+    try:
+        key_stat = key_entry.stat()
+        return key_stat, _get_indexed_key_fingerprint(Path(key_entry.path), key_stat), None
+    except Exception as e:
+        return None, None, e
+
+
+def _forget_key_fingerprint(key_path: Path) -> None:
+    """Drops a removed key from the fingerprint index."""
+    global _fingerprint_index_dirty
+    if _load_fingerprint_index().pop(str(key_path), None) is not None:
+        _fingerprint_index_dirty = True
+
+
+def _load_remotes_config() -> Dict[str, Any]:
+    """
+    Loads the remotes configuration, reusing the parsed content while the file is unchanged.
+
+    Returns:
+        A copy of the parsed config, safe for the caller to modify.
+    """
+    st = KEY_REMOTES_CONFIG.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _remotes_config_cache.get(KEY_REMOTES_CONFIG)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, read_json(KEY_REMOTES_CONFIG))
+        _remotes_config_cache[KEY_REMOTES_CONFIG] = cached
+    return copy.deepcopy(cached[1])
+
+
+def _save_remotes_config(config: Dict[str, Any]) -> None:
+    """Writes the remotes configuration and invalidates the cached copy."""
+    write_json(KEY_REMOTES_CONFIG, config)
+    _remotes_config_cache.pop(KEY_REMOTES_CONFIG, None)
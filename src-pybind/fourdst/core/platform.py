@@ -1,13 +1,14 @@
 # fourdst/core/platform.py
 
-import json
+import os
+import hashlib
 import platform
 import shutil
 import subprocess
 from pathlib import Path
 
-from fourdst.core.config import ABI_CACHE_FILE, CACHE_PATH
-from fourdst.core.utils import run_command
+from fourdst.core.config import ABI_CACHE_FILE, ABI_DETECTOR_BIN_PATH, CACHE_PATH
+from fourdst.core.utils import run_command, read_json, write_json
 
 ABI_DETECTOR_CPP_SRC = """
 #include <iostream>
@@ -92,6 +93,32 @@ project('abi-detector', 'cpp', default_options : ['cpp_std=c++23'])
 executable('detector', 'main.cpp')
 """
 
+def _get_cached_detector_path() -> Path | None:
+    """
+    Returns where the compiled ABI detector is cached for the current C++ compiler.
+
+    The key covers the compiler meson would pick (CXX or the default c++), its
+    modification time and the detector sources, so upgrading the compiler or
+    changing the detector invalidates the cached binary. Returns None if no
+    compiler can be located.
+    """
+    compiler = os.environ.get("CXX", "").split()
+    compiler_path = shutil.which(compiler[0]) if compiler else None
+    if compiler_path is None:
+        compiler_path = next((found for found in map(shutil.which, ("c++", "g++", "clang++")) if found), None)
+    if compiler_path is None:
+        return None
+
+    compiler_path = os.path.realpath(compiler_path)
+    key_source = "\0".join([
+        compiler_path,
+        str(os.stat(compiler_path).st_mtime_ns),
+        ABI_DETECTOR_CPP_SRC,
+        ABI_DETECTOR_MESON_SRC
+    ])
+    cache_key = hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+    return ABI_DETECTOR_BIN_PATH / cache_key / "detector"
+
 def _detect_and_cache_abi() -> dict:
     """
     Compiles and runs a C++ program to detect the compiler ABI, then caches it.
@@ -104,28 +131,38 @@ def _detect_and_cache_abi() -> dict:
     logger = logging.getLogger(__name__)
     logger.info("Performing one-time native C++ ABI detection...")
     
-    # Check if meson is available
-    meson_available = shutil.which("meson") is not None
-    
-    if not meson_available:
-        logger.warning("Meson not available, using fallback platform detection")
-        return _fallback_platform_detection()
-    
     temp_dir = CACHE_PATH / "abi_detector"
-    if temp_dir.exists():
-        shutil.rmtree(temp_dir)
-    temp_dir.mkdir(parents=True)
 
     try:
-        (temp_dir / "main.cpp").write_text(ABI_DETECTOR_CPP_SRC)
-        (temp_dir / "meson.build").write_text(ABI_DETECTOR_MESON_SRC)
-
-        logger.info("  - Configuring detector...")
-        run_command(["meson", "setup", "build"], cwd=temp_dir)
-        logger.info("  - Compiling detector...")
-        run_command(["meson", "compile", "-C", "build"], cwd=temp_dir)
+        cached_detector = _get_cached_detector_path()
+        if cached_detector is not None and cached_detector.exists():
+            logger.info("  - Reusing cached detector build...")
+            detector_exe = cached_detector
+        else:
+            # Check if meson is available
+            meson_available = shutil.which("meson") is not None
+
+            if not meson_available:
+                logger.warning("Meson not available, using fallback platform detection")
+                return _fallback_platform_detection()
+
+            if temp_dir.exists():
+                shutil.rmtree(temp_dir)
+            temp_dir.mkdir(parents=True)
+
+            (temp_dir / "main.cpp").write_text(ABI_DETECTOR_CPP_SRC)
+            (temp_dir / "meson.build").write_text(ABI_DETECTOR_MESON_SRC)
+
+            logger.info("  - Configuring detector...")
+            run_command(["meson", "setup", "build"], cwd=temp_dir, stream=True)
+            logger.info("  - Compiling detector...")
+            run_command(["meson", "compile", "-C", "build"], cwd=temp_dir, stream=True)
+
+            detector_exe = temp_dir / "build" / "detector"
+            if cached_detector is not None:
+                cached_detector.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(detector_exe, cached_detector)
 
-        detector_exe = temp_dir / "build" / "detector"
         logger.info("  - Running detector...")
         proc = subprocess.run([str(detector_exe)], check=True, capture_output=True, text=True)
         
@@ -150,8 +187,7 @@ def _detect_and_cache_abi() -> dict:
             "docker_image": None
         }
 
-        with open(ABI_CACHE_FILE, 'w') as f:
-            json.dump(platform_data, f, indent=4)
+        write_json(ABI_CACHE_FILE, platform_data)
         
         logger.info(f"  - ABI details cached to {ABI_CACHE_FILE}")
         return platform_data
@@ -246,8 +282,7 @@ def _fallback_platform_detection() -> dict:
     # Cache the result
     try:
         CACHE_PATH.mkdir(parents=True, exist_ok=True)
-        with open(ABI_CACHE_FILE, 'w') as f:
-            json.dump(platform_data, f, indent=4)
+        write_json(ABI_CACHE_FILE, platform_data)
         logger.info(f"Fallback platform data cached to {ABI_CACHE_FILE}")
     except Exception as e:
         logger.warning(f"Failed to cache platform data: {e}")
@@ -255,17 +290,23 @@ def _fallback_platform_detection() -> dict:
     return platform_data
 
 
+# Native platform identifier, loaded at most once per process
+_platform_identifier = None
+
 def get_platform_identifier() -> dict:
     """
     Gets the native platform identifier, using a cached value if available.
     """
-    if ABI_CACHE_FILE.exists():
-        with open(ABI_CACHE_FILE, 'r') as f:
-            plat = json.load(f)
-    else:
-        plat = _detect_and_cache_abi()
-    plat['type'] = 'native'
-    return plat
+    global _platform_identifier
+    if _platform_identifier is None:
+        if ABI_CACHE_FILE.exists():
+            plat = read_json(ABI_CACHE_FILE)
+        else:
+            plat = _detect_and_cache_abi()
+        plat['type'] = 'native'
+        _platform_identifier = plat
+    # Callers extend the returned dict (e.g. with "os"), so they get their own copy
+    return dict(_platform_identifier)
 
 def _parse_version(version_str: str) -> tuple:
     """Parses a version string like '12.3.1' into a tuple of integers."""
@@ -1,16 +1,34 @@
 # fourdst/core/plugin.py
 
+import io
+import os
+import re
 import yaml
 import zipfile
+import shlex
 import shutil
-import tempfile
 import difflib
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional, Tuple
 import logging
 
-from fourdst.cli.common.utils import calculate_sha256, run_command, get_template_content
+from fourdst.cli.common.utils import (
+    calculate_sha256, run_command, get_template_content, get_clang_index, get_clang_parse_options, iter_class_definitions,
+    load_cached_interfaces, store_cached_interfaces
+)
 from fourdst.cli.common.templates import GITIGNORE_CONTENT
+from fourdst.core.config import BUNDLE_ZIP_COMPRESSLEVEL, PRECOMPRESSED_SUFFIXES
+from fourdst.core.utils import load_yaml, extract_zip, add_files_to_zip, open_zip_member_seekable
+
+# Bundle directory binaries hashed concurrently when validating
+MAX_HASH_WORKERS = 8
+
+# Placeholder body of every generated method stub
+METHOD_STUB_BODY = "      // TODO: Implement this method"
+
+# Runs of characters that separate the words of a project name in its class name
+_NON_ALNUM_PATTERN = re.compile(r'[\W_]+')
 
 
 def parse_cpp_interface(header_path: Path) -> Dict[str, Any]:
@@ -49,9 +67,18 @@ def parse_cpp_interface(header_path: Path) -> Dict[str, Any]:
                     'error': f"libclang library not found. Please ensure it's installed and in your system's path. Details: {e}"
                 }
 
-        index = cindex.Index.create()
-        args = ['-x', 'c++', '-std=c++17']
-        translation_unit = index.parse(str(header_path), args=args)
+        # Warnings are never looked at, so clang need not produce them
+        args = ['-x', 'c++', '-std=c++17', '-Wno-everything']
+        options = get_clang_parse_options(cindex)
+        interfaces = load_cached_interfaces(header_path, args, options)
+        if interfaces is not None:
+            return {
+                'success': True,
+                'data': interfaces
+            }
+
+        index = get_clang_index(cindex)
+        translation_unit = index.parse(str(header_path), args=args, options=options)
 
         if not translation_unit:
             return {
@@ -60,34 +87,29 @@ def parse_cpp_interface(header_path: Path) -> Dict[str, Any]:
             }
 
         interfaces = {}
+        cxx_method = cindex.CursorKind.CXX_METHOD
 
-        def walk_ast(node):
-            if node.kind == cindex.CursorKind.CLASS_DECL and node.is_definition():
-                pv_methods = [m for m in node.get_children()
-                              if m.kind == cindex.CursorKind.CXX_METHOD and m.is_pure_virtual_method()]
-                
-                if pv_methods:
-                    interface_name = node.spelling
-                    methods = []
-                    for method in pv_methods:
-                        args_str = ', '.join([arg.type.spelling for arg in method.get_arguments()])
-                        sig = f"{method.result_type.spelling} {method.spelling}({args_str})"
-                        
-                        if method.is_const_method():
-                             sig += " const"
-
-                        methods.append({
-                            "signature": sig, 
-                            "body": "      // TODO: Implement this method"
-                        })
-                    
-                    interfaces[interface_name] = methods
+        # Only classes defined in the header itself matter, not the ones it includes
+        for _, node in iter_class_definitions(translation_unit, cindex, {Path(header_path).resolve()}):
+            methods = []
+            for method in node.get_children():
+                if method.kind != cxx_method or not method.is_pure_virtual_method():
+                    continue
+                args_str = ', '.join(arg.type.spelling for arg in method.get_arguments())
+                sig = f"{method.result_type.spelling} {method.spelling}({args_str})"
 
-            for child in node.get_children():
-                walk_ast(child)
+                if method.is_const_method():
+                    sig += " const"
 
-        walk_ast(translation_unit.cursor)
-        
+                methods.append({
+                    "signature": sig,
+                    "body": METHOD_STUB_BODY
+                })
+
+            if methods: # Only classes with pure virtual methods are interfaces
+                interfaces[node.spelling] = methods
+
+        store_cached_interfaces(cindex, translation_unit, header_path, args, options, interfaces)
         return {
             'success': True,
             'data': interfaces
@@ -137,12 +159,13 @@ def generate_plugin_project(config: Dict[str, Any]) -> Dict[str, Any]:
         interfaces = config['interfaces']
 
         # Generate method stubs
-        method_stubs = "\n".join(
+        # A list is joined faster than a generator, which join would turn into one anyway
+        method_stubs = "\n".join([
             f"    {method['signature']} override {{\n{method['body']}\n    }}"
             for method in interfaces[chosen_interface]
-        )
+        ])
 
-        class_name = ''.join(filter(str.isalnum, project_name.replace('_', ' ').title().replace(' ', ''))) + "Plugin"
+        class_name = _NON_ALNUM_PATTERN.sub(' ', project_name).title().replace(' ', '') + "Plugin"
         root_path = directory / project_name
         src_path = root_path / "src"
         include_path = src_path / "include"
@@ -199,10 +222,19 @@ depth = 1
         files_created.append(str(gitignore_file.relative_to(root_path)))
 
         # Initialize Git Repository
-        run_command(["git", "init"], cwd=root_path)
-        run_command(["git", "add", "."], cwd=root_path)
         commit_message = f"Initial commit: Scaffold fourdst plugin '{project_name}'"
-        run_command(["git", "commit", "-m", commit_message], cwd=root_path)
+        git_commands = [
+            ["git", "init", "-q"],
+            ["git", "add", "-A"],
+            ["git", "commit", "-q", "-m", commit_message],
+        ]
+        shell = shutil.which("sh")
+        if shell:
+            # One process spawn from here instead of three
+            run_command([shell, "-c", " && ".join(shlex.join(command) for command in git_commands)], cwd=root_path)
+        else:
+            for command in git_commands:
+                run_command(command, cwd=root_path)
 
         return {
             'success': True,
@@ -230,7 +262,8 @@ def validate_bundle_directory(directory: Path) -> Dict[str, Any]:
             "success": bool,
             "data": {
                 "errors": [str, ...],
-                "is_signed": bool
+                "is_signed": bool,
+                "files": [str, ...]  # the bundle files the manifest references, sorted
             },
             "error": str (if success=False)
         }
@@ -245,54 +278,75 @@ def validate_bundle_directory(directory: Path) -> Dict[str, Any]:
                 'success': True,
                 'data': {
                     'errors': errors,
-                    'is_signed': False
+                    'is_signed': False,
+                    'files': []
                 }
             }
 
         try:
-            with open(manifest_path, 'r') as f:
-                manifest = yaml.safe_load(f)
+            manifest = load_yaml(manifest_path.read_bytes())
         except yaml.YAMLError as e:
             errors.append(f"Invalid YAML in manifest.yaml: {e}")
             return {
                 'success': True,
                 'data': {
                     'errors': errors,
-                    'is_signed': False
+                    'is_signed': False,
+                    'files': []
                 }
             }
 
-        # Check that all files referenced in the manifest exist
+        # Hash every binary that has a checksum to validate up front; hashlib releases
+        # the GIL while hashing, so the files are hashed side by side
+        paths_to_hash = {
+            binary['path']
+            for plugin_data in manifest.get('bundlePlugins', {}).values()
+            for binary in plugin_data.get('binaries', [])
+            if binary.get('path') and binary.get('checksum') and (directory / binary['path']).is_file()
+        }
+        with ThreadPoolExecutor(max_workers=MAX_HASH_WORKERS) as executor:
+            actual_checksums = dict(zip(paths_to_hash, executor.map(
+                lambda binary_path: "sha256:" + calculate_sha256(directory / binary_path), paths_to_hash
+            )))
+
+        # Check that all files referenced in the manifest exist, collecting them for packing
+        files = {"manifest.yaml"}
         for plugin_name, plugin_data in manifest.get('bundlePlugins', {}).items():
             sdist_info = plugin_data.get('sdist', {})
             if sdist_info:
                 sdist_path = sdist_info.get('path')
-                if sdist_path and not (directory / sdist_path).is_file():
-                    errors.append(f"Missing sdist file for '{plugin_name}': {sdist_path}")
+                if sdist_path:
+                    if (directory / sdist_path).is_file():
+                        files.add(sdist_path)
+                    else:
+                        errors.append(f"Missing sdist file for '{plugin_name}': {sdist_path}")
             
             for binary in plugin_data.get('binaries', []):
                 binary_path = binary.get('path')
-                if binary_path and not (directory / binary_path).is_file():
-                    errors.append(f"Missing binary file for '{plugin_name}': {binary_path}")
+                if binary_path:
+                    if binary_path in files or (directory / binary_path).is_file():
+                        files.add(binary_path)
+                    else:
+                        errors.append(f"Missing binary file for '{plugin_name}': {binary_path}")
                 
                 # If checksums exist, validate them
                 expected_checksum = binary.get('checksum')
-                if binary_path and expected_checksum:
-                    file_to_check = directory / binary_path
-                    if file_to_check.is_file():
-                        actual_checksum = "sha256:" + calculate_sha256(file_to_check)
-                        if actual_checksum != expected_checksum:
-                            errors.append(f"Checksum mismatch for '{binary_path}'")
+                if binary_path and expected_checksum and binary_path in actual_checksums:
+                    if actual_checksums[binary_path] != expected_checksum:
+                        errors.append(f"Checksum mismatch for '{binary_path}'")
 
         # Check if bundle is signed
-        is_signed = ('bundleAuthorKeyFingerprint' in manifest and 
-                    (directory / "manifest.sig").exists())
+        has_signature_file = (directory / "manifest.sig").is_file()
+        if has_signature_file:
+            files.add("manifest.sig")
+        is_signed = 'bundleAuthorKeyFingerprint' in manifest and has_signature_file
 
         return {
             'success': True,
             'data': {
                 'errors': errors,
-                'is_signed': is_signed
+                'is_signed': is_signed,
+                'files': sorted(files)
             }
         }
 
@@ -304,7 +358,21 @@ def validate_bundle_directory(directory: Path) -> Dict[str, Any]:
         }
 
 
-def pack_bundle_directory(directory: Path, output_config: Dict[str, Any]) -> Dict[str, Any]:
+def _iter_files(root: Path):
+    """
+    Yields every file below root. The file type comes with each os.scandir entry,
+    so unlike rglob plus is_file this needs no extra stat per file.
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_files(Path(entry.path))
+            elif entry.is_file():
+                yield Path(entry.path)
+
+
+def pack_bundle_directory(directory: Path, output_config: Dict[str, Any],
+                          validation_result: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Packs a directory into a .fbundle archive.
     
@@ -312,8 +380,12 @@ def pack_bundle_directory(directory: Path, output_config: Dict[str, Any]) -> Dic
         directory: Path to directory to pack
         output_config: {
             "name": str (optional, defaults to directory name),
-            "output_dir": Path (optional, defaults to directory.parent)
+            "output_dir": Path (optional, defaults to directory.parent),
+            "include_unreferenced": bool (optional, defaults to False; also pack files
+                the manifest does not reference)
         }
+        validation_result: The result of validate_bundle_directory for this directory,
+            if the caller already ran it; it is run here otherwise
     
     Returns:
         Dict with structure:
@@ -328,8 +400,9 @@ def pack_bundle_directory(directory: Path, output_config: Dict[str, Any]) -> Dic
         }
     """
     try:
-        # First validate the directory
-        validation_result = validate_bundle_directory(directory)
+        # First validate the directory, unless the caller just did
+        if validation_result is None:
+            validation_result = validate_bundle_directory(directory)
         if not validation_result['success']:
             return validation_result
         
@@ -343,13 +416,18 @@ def pack_bundle_directory(directory: Path, output_config: Dict[str, Any]) -> Dic
         output_dir = output_config.get('output_dir', directory.parent)
         output_path = output_dir / f"{output_name}.fbundle"
 
-        files_packed = 0
-        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as bundle_zip:
-            for file_to_add in directory.rglob('*'):
-                if file_to_add.is_file():
-                    arcname = file_to_add.relative_to(directory)
-                    bundle_zip.write(file_to_add, arcname)
-                    files_packed += 1
+        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=BUNDLE_ZIP_COMPRESSLEVEL) as bundle_zip:
+            # Sorted so that packing the same directory gives the same archive
+            if output_config.get('include_unreferenced', False):
+                files_to_add = sorted(_iter_files(directory))
+            else:
+                files_to_add = [directory / f for f in validation_result['data']['files']]
+            add_files_to_zip(bundle_zip, (
+                (file_to_add, file_to_add.relative_to(directory),
+                 zipfile.ZIP_STORED if file_to_add.suffix in PRECOMPRESSED_SUFFIXES else None)
+                for file_to_add in files_to_add
+            ))
+            files_packed = len(files_to_add)
 
         return {
             'success': True,
@@ -386,23 +464,16 @@ def extract_plugin_from_bundle(bundle_path: Path, plugin_name: str, output_path:
     try:
         output_path.mkdir(parents=True, exist_ok=True)
         
-        with tempfile.TemporaryDirectory() as temp_dir_str:
-            temp_dir = Path(temp_dir_str)
-            
-            # Unpack the main bundle
-            with zipfile.ZipFile(bundle_path, 'r') as bundle_zip:
-                bundle_zip.extractall(temp_dir)
-
+        # Only the manifest and the one sdist are read out of the bundle
+        with zipfile.ZipFile(bundle_path, 'r') as bundle_zip:
             # Read the manifest
-            manifest_path = temp_dir / "manifest.yaml"
-            if not manifest_path.exists():
+            if "manifest.yaml" not in bundle_zip.namelist():
                 return {
                     'success': False,
                     'error': "Bundle is invalid. Missing manifest.yaml."
                 }
             
-            with open(manifest_path, 'r') as f:
-                manifest = yaml.safe_load(f)
+            manifest = load_yaml(bundle_zip.read("manifest.yaml"))
 
             # Find the plugin and its sdist
             plugin_data = manifest.get('bundlePlugins', {}).get(plugin_name)
@@ -420,27 +491,26 @@ def extract_plugin_from_bundle(bundle_path: Path, plugin_name: str, output_path:
                     'error': f"Source distribution (sdist) not found for plugin '{plugin_name}'."
                 }
 
-            sdist_path_in_bundle = temp_dir / sdist_info['path']
-            if not sdist_path_in_bundle.is_file():
+            if sdist_info['path'] not in bundle_zip.namelist():
                 return {
                     'success': False,
                     'error': f"sdist file '{sdist_info['path']}' is missing from the bundle archive."
                 }
 
-            # Extract the sdist to the final output directory
+            # Extract the sdist to the final output directory, reading it in place from the bundle
             final_destination = output_path / plugin_name
             final_destination.mkdir(parents=True, exist_ok=True)
 
-            with zipfile.ZipFile(sdist_path_in_bundle, 'r') as sdist_zip:
-                sdist_zip.extractall(final_destination)
+            with open_zip_member_seekable(bundle_zip, sdist_info['path']) as sdist_file:
+                extract_zip(sdist_file, final_destination)
 
-            return {
-                'success': True,
-                'data': {
-                    'output_path': str(final_destination.resolve()),
-                    'plugin_info': plugin_data
-                }
+        return {
+            'success': True,
+            'data': {
+                'output_path': str(final_destination.resolve()),
+                'plugin_info': plugin_data
             }
+        }
 
     except zipfile.BadZipFile:
         return {
@@ -455,6 +525,82 @@ def extract_plugin_from_bundle(bundle_path: Path, plugin_name: str, output_path:
         }
 
 
+class _PrecomputedOpcodes(difflib.SequenceMatcher):
+    """A SequenceMatcher that only hands out opcodes computed beforehand, for get_grouped_opcodes."""
+
+    def __init__(self, opcodes):
+        self._opcodes = opcodes
+
+    def get_opcodes(self):
+        return self._opcodes
+
+def _format_hunk_range(start: int, stop: int) -> str:
+    """Formats a hunk range like difflib.unified_diff: "3,2", "3" for one line, "2,0" for none."""
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    return f"{start + 1 if length else start},{length}"
+
+def _unified_diff(lines_a: List[str], lines_b: List[str], fromfile: str, tofile: str, n: int = 3):
+    """
+    difflib.unified_diff, tuned for files that are mostly the same.
+
+    Only the lines between the common start and end of both files go through
+    SequenceMatcher, since its cost grows much faster than linearly with the
+    input. The shared lines are added back as unchanged, so every hunk gets its
+    full n lines of context from them. Where repeated lines allow several equally
+    good alignments, the one picked may differ from difflib's, which weighs
+    matches across the whole file.
+    """
+    common_limit = min(len(lines_a), len(lines_b))
+    prefix = 0
+    while prefix < common_limit and lines_a[prefix] == lines_b[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < common_limit - prefix and lines_a[-1 - suffix] == lines_b[-1 - suffix]:
+        suffix += 1
+    end_a = len(lines_a) - suffix
+    end_b = len(lines_b) - suffix
+
+    matcher = difflib.SequenceMatcher(None, lines_a[prefix:end_a], lines_b[prefix:end_b])
+    opcodes = [('equal', 0, prefix, 0, prefix)]
+    opcodes += [(tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix)
+                for tag, i1, i2, j1, j2 in matcher.get_opcodes()]
+    opcodes.append(('equal', end_a, len(lines_a), end_b, len(lines_b)))
+
+    # Merge the added unchanged runs with their neighbours, and drop the empty ones
+    merged = []
+    for opcode in opcodes:
+        tag, i1, i2, j1, j2 = opcode
+        if i1 == i2 and j1 == j2:
+            continue
+        if tag == 'equal' and merged and merged[-1][0] == 'equal':
+            merged[-1] = ('equal', merged[-1][1], i2, merged[-1][3], j2)
+        else:
+            merged.append(opcode)
+
+    # Same output as difflib.unified_diff, from the opcodes above
+    started = False
+    for group in _PrecomputedOpcodes(merged).get_grouped_opcodes(n):
+        if not started:
+            started = True
+            yield f"--- {fromfile}\n"
+            yield f"+++ {tofile}\n"
+
+        first, last = group[0], group[-1]
+        yield f"@@ -{_format_hunk_range(first[1], last[2])} +{_format_hunk_range(first[3], last[4])} @@\n"
+        for tag, i1, i2, j1, j2 in group:
+            if tag == 'equal':
+                for line in lines_a[i1:i2]:
+                    yield ' ' + line
+                continue
+            if tag in ('replace', 'delete'):
+                for line in lines_a[i1:i2]:
+                    yield '-' + line
+            if tag in ('replace', 'insert'):
+                for line in lines_b[j1:j2]:
+                    yield '+' + line
+
 def compare_plugin_sources(bundle_a_path: Path, bundle_b_path: Path, plugin_name: str) -> Dict[str, Any]:
     """
     Compares the source code of a specific plugin between two different bundles.
@@ -479,81 +625,88 @@ def compare_plugin_sources(bundle_a_path: Path, bundle_b_path: Path, plugin_name
         }
     """
     try:
-        def extract_sdist(bundle_path: Path, plugin_name: str, temp_dir: Path):
-            """Helper function to extract sdist from bundle."""
-            sdist_extract_path = temp_dir / f"{plugin_name}_src"
-            
-            with tempfile.TemporaryDirectory() as bundle_unpack_dir_str:
-                bundle_unpack_dir = Path(bundle_unpack_dir_str)
-                
-                with zipfile.ZipFile(bundle_path, 'r') as bundle_zip:
-                    bundle_zip.extractall(bundle_unpack_dir)
-                    
-                manifest_path = bundle_unpack_dir / "manifest.yaml"
-                if not manifest_path.exists():
+        def read_sdist(bundle_path: Path, plugin_name: str) -> bytes:
+            """Helper function to read a plugin's sdist archive straight out of the bundle zip."""
+            with zipfile.ZipFile(bundle_path, 'r') as bundle_zip:
+                try:
+                    manifest = load_yaml(bundle_zip.read("manifest.yaml"))
+                except KeyError:
                     raise FileNotFoundError("manifest.yaml not found in bundle.")
                     
-                with open(manifest_path, 'r') as f:
-                    manifest = yaml.safe_load(f)
-                    
-                plugin_data = manifest.get('bundlePlugins', {}).get(plugin_name)
+                plugin_data = (manifest or {}).get('bundlePlugins', {}).get(plugin_name)
                 if not plugin_data or 'sdist' not in plugin_data:
                     raise FileNotFoundError(f"Plugin '{plugin_name}' or its sdist not found in {bundle_path.name}.")
                     
-                sdist_path_in_bundle = bundle_unpack_dir / plugin_data['sdist']['path']
-                if not sdist_path_in_bundle.exists():
+                try:
+                    return bundle_zip.read(plugin_data['sdist']['path'])
+                except KeyError:
                     raise FileNotFoundError(f"sdist archive '{plugin_data['sdist']['path']}' not found in bundle.")
-                    
-                with zipfile.ZipFile(sdist_path_in_bundle, 'r') as sdist_zip:
-                    sdist_zip.extractall(sdist_extract_path)
-                    
-            return sdist_extract_path
 
-        with tempfile.TemporaryDirectory() as temp_a_str, tempfile.TemporaryDirectory() as temp_b_str:
-            try:
-                src_a_path = extract_sdist(bundle_a_path, plugin_name, Path(temp_a_str))
-                src_b_path = extract_sdist(bundle_b_path, plugin_name, Path(temp_b_str))
-            except FileNotFoundError as e:
-                return {
-                    'success': False,
-                    'error': str(e)
-                }
+        def read_text(data: bytes) -> str:
+            """Decodes file content the way Path.read_text does."""
+            return io.TextIOWrapper(io.BytesIO(data)).read()
 
-            files_a = {p.relative_to(src_a_path) for p in src_a_path.rglob('*') if p.is_file()}
-            files_b = {p.relative_to(src_b_path) for p in src_b_path.rglob('*') if p.is_file()}
+        try:
+            sdist_a = read_sdist(bundle_a_path, plugin_name)
+            sdist_b = read_sdist(bundle_b_path, plugin_name)
+        except FileNotFoundError as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
 
-            added_files = list(sorted(files_b - files_a))
-            removed_files = list(sorted(files_a - files_b))
-            common_files = files_a & files_b
-            
-            modified_files = []
-            for file_rel_path in sorted(list(common_files)):
-                content_a = (src_a_path / file_rel_path).read_text()
-                content_b = (src_b_path / file_rel_path).read_text()
-
-                if content_a != content_b:
-                    diff = ''.join(difflib.unified_diff(
-                        content_a.splitlines(keepends=True),
-                        content_b.splitlines(keepends=True),
-                        fromfile=f"a/{file_rel_path}",
-                        tofile=f"b/{file_rel_path}",
-                    ))
-                    modified_files.append({
-                        'file_path': str(file_rel_path),
-                        'diff': diff
-                    })
-
-            has_changes = bool(added_files or removed_files or modified_files)
+        added_files = []
+        removed_files = []
+        modified_files = []
+
+        # Identical sdists (the common case for plugins that did not change) need no further work
+        if sdist_a != sdist_b:
+            # The sdists are compared member by member in memory, without unpacking them
+            with zipfile.ZipFile(io.BytesIO(sdist_a)) as sdist_a_zip, zipfile.ZipFile(io.BytesIO(sdist_b)) as sdist_b_zip:
+                infos_a = {Path(info.filename): info for info in sdist_a_zip.infolist() if not info.is_dir()}
+                infos_b = {Path(info.filename): info for info in sdist_b_zip.infolist() if not info.is_dir()}
+
+                added_files = list(sorted(infos_b.keys() - infos_a.keys()))
+                removed_files = list(sorted(infos_a.keys() - infos_b.keys()))
+                common_files = infos_a.keys() & infos_b.keys()
+
+                for file_rel_path in sorted(common_files):
+                    info_a = infos_a[file_rel_path]
+                    info_b = infos_b[file_rel_path]
+                    # Different sizes or CRCs mean different content; equal ones are confirmed on the bytes
+                    data_a = data_b = None
+                    if info_a.file_size == info_b.file_size and info_a.CRC == info_b.CRC:
+                        data_a = sdist_a_zip.read(info_a)
+                        data_b = sdist_b_zip.read(info_b)
+                        if data_a == data_b:
+                            continue
+
+                    content_a = read_text(sdist_a_zip.read(info_a) if data_a is None else data_a)
+                    content_b = read_text(sdist_b_zip.read(info_b) if data_b is None else data_b)
+
+                    if content_a != content_b:
+                        diff = ''.join(_unified_diff(
+                            content_a.splitlines(keepends=True),
+                            content_b.splitlines(keepends=True),
+                            fromfile=f"a/{file_rel_path}",
+                            tofile=f"b/{file_rel_path}",
+                        ))
+                        modified_files.append({
+                            'file_path': str(file_rel_path),
+                            'diff': diff
+                        })
 
-            return {
-                'success': True,
-                'data': {
-                    'has_changes': has_changes,
-                    'added_files': [str(f) for f in added_files],
-                    'removed_files': [str(f) for f in removed_files],
-                    'modified_files': modified_files
-                }
+        has_changes = bool(added_files or removed_files or modified_files)
+
+        return {
+            'success': True,
+            'data': {
+                'has_changes': has_changes,
+                'added_files': [str(f) for f in added_files],
+                'removed_files': [str(f) for f in removed_files],
+                'modified_files': modified_files
             }
+        }
 
     except Exception as e:
         logging.exception(f"Unexpected error comparing plugin {plugin_name} between bundles")
@@ -563,6 +716,9 @@ def compare_plugin_sources(bundle_a_path: Path, bundle_b_path: Path, plugin_name
         }
 
 
+# The meson.build functions validate_plugin_project looks for, found in a single scan
+_MESON_CALL_PATTERN = re.compile(r'\b(project|shared_library|test)\s*\(')
+
 def validate_plugin_project(project_path: Path) -> Dict[str, Any]:
     """
     Validates a plugin's structure and meson.build file.
@@ -615,22 +771,33 @@ def validate_plugin_project(project_path: Path) -> Dict[str, Any]:
 
         # Check for meson.build
         meson_file = project_path / "meson.build"
-        meson_content = ""
+        meson_calls = set()
         if check(meson_file.exists(), "meson_build_exists", "Found meson.build file.", "Missing meson.build file."):
             meson_content = meson_file.read_text()
+            meson_calls = {match.group(1) for match in _MESON_CALL_PATTERN.finditer(meson_content)}
             # Check for project() definition
-            check("project(" in meson_content, "has_project_definition", "Contains project() definition.", "meson.build is missing a project() definition.", is_warning=True)
+            check("project" in meson_calls, "has_project_definition", "Contains project() definition.", "meson.build is missing a project() definition.", is_warning=True)
             # Check for shared_library()
-            check("shared_library(" in meson_content, "has_shared_library", "Contains shared_library() definition.", "meson.build does not appear to define a shared_library().")
-
-        # Check for source files
-        has_cpp = any(project_path.rglob("*.cpp"))
-        has_h = any(project_path.rglob("*.h")) or any(project_path.rglob("*.hpp"))
+            check("shared_library" in meson_calls, "has_shared_library", "Contains shared_library() definition.", "meson.build does not appear to define a shared_library().")
+
+        # Check for source files, in one walk that skips build output, dependencies and
+        # git metadata and stops as soon as both kinds were found
+        has_cpp = has_h = False
+        for root, dirs, files in os.walk(project_path):
+            dirs[:] = [d for d in dirs if d not in ('builddir', 'subprojects', '.git')]
+            for file in files:
+                suffix = os.path.splitext(file)[1]
+                if suffix == '.cpp':
+                    has_cpp = True
+                elif suffix in ('.h', '.hpp'):
+                    has_h = True
+            if has_cpp and has_h:
+                break
         check(has_cpp, "has_cpp_files", "Found C++ source files (.cpp).", "No .cpp source files found in the directory.", is_warning=True)
         check(has_h, "has_header_files", "Found C++ header files (.h/.hpp).", "No .h or .hpp header files found in the directory.", is_warning=True)
 
         # Check for test definition (optional)
-        check("test(" in meson_content, "has_tests", "Contains test() definitions.", "No test() definitions found in meson.build. Consider adding tests.", is_warning=True)
+        check("test" in meson_calls, "has_tests", "Contains test() definitions.", "No test() definitions found in meson.build. Consider adding tests.", is_warning=True)
 
         return {
             'success': True,
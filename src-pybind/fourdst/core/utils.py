@@ -1,15 +1,48 @@
 # fourdst/core/utils.py
 
+import os
+import io
+import copy
+import json
+import contextlib
+import collections
+import mmap
+import struct
+import zlib
+import zipfile
 import subprocess
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import hashlib
 
-def run_command(command: list[str], cwd: Path = None, check=True, progress_callback=None, input: bytes = None, env: dict = None, binary_output: bool = False):
-    """Runs a command, optionally reporting progress and using a custom environment."""
+try:
+    import orjson
+except ImportError:
+    orjson = None # orjson is an optional, faster JSON backend
+
+try:
+    import deflate
+except ImportError:
+    deflate = None # deflate (libdeflate bindings) is an optional, faster inflate backend
+
+# Lines of output kept for the error message of a failed streamed command
+STREAM_OUTPUT_TAIL_LINES = 200
+
+def run_command(command: list[str], cwd: Path = None, check=True, progress_callback=None, input: bytes = None, env: dict = None, binary_output: bool = False, stream: bool = False):
+    """
+    Runs a command, optionally reporting progress and using a custom environment.
+
+    With stream=True (meant for long, chatty commands such as meson builds) stdout and
+    stderr are merged and reported line by line as they are produced instead of being
+    buffered; only the last STREAM_OUTPUT_TAIL_LINES lines are kept for the result.
+    """
     command_str = ' '.join(command)
     if progress_callback:
         progress_callback(f"Running command: {command_str}")
 
+    if stream:
+        return _run_streamed_command(command, command_str, cwd, check, progress_callback, env)
+
     try:
         result = subprocess.run(
             command, 
@@ -38,10 +71,394 @@ def run_command(command: list[str], cwd: Path = None, check=True, progress_callb
             raise Exception(error_message) from e
         return e
 
+def _run_streamed_command(command: list[str], command_str: str, cwd: Path, check: bool, progress_callback, env: dict):
+    """Implements run_command(stream=True)."""
+    output_tail = collections.deque(maxlen=STREAM_OUTPUT_TAIL_LINES)
+    with subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        stdin=subprocess.DEVNULL,
+        text=True,
+        errors='replace',
+        cwd=cwd,
+        env=env
+    ) as process:
+        for line in process.stdout:
+            line = line.rstrip()
+            output_tail.append(line)
+            if progress_callback:
+                progress_callback(f"  | {line}")
+    output = '\n'.join(output_tail)
+
+    if process.returncode != 0 and check:
+        error_message = f"""Command '{command_str}' failed with exit code {process.returncode}.\n--- OUTPUT (last {STREAM_OUTPUT_TAIL_LINES} lines) ---\n{output}\n"""
+        if progress_callback:
+            progress_callback(error_message)
+        raise Exception(error_message) from subprocess.CalledProcessError(process.returncode, command, output=output)
+    return subprocess.CompletedProcess(command, process.returncode, stdout=output, stderr='')
+
+# Read size for hashing without hashlib.file_digest; large reads keep the Python loop short
+HASH_CHUNK_SIZE = 1 << 20
+
+# Files at least this large are hashed through mmap instead of read() calls
+MMAP_HASH_THRESHOLD = 16 << 20
+
+def calculate_file_digest(file_path: Path, algorithm: str = "sha256"):
+    """
+    Hashes a file and returns the hashlib object, so callers can take hexdigest(),
+    digest() or copy() it without reading the file again.
+    """
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_HASH_THRESHOLD:
+            # One update over the mapped file lets OpenSSL run its (SHA-NI) block loop
+            # across the whole file with the GIL released and no intermediate buffers
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return hashlib.new(algorithm, mapped)
+        if hasattr(hashlib, "file_digest"):
+            # Python 3.11+: hashes straight from the file without a Python-level read loop
+            return hashlib.file_digest(f, algorithm)
+        digest = hashlib.new(algorithm)
+        for byte_block in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(byte_block)
+    return digest
+
 def calculate_sha256(file_path: Path) -> str:
     """Calculates the SHA256 checksum of a file."""
-    sha256_hash = hashlib.sha256()
-    with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
-    return sha256_hash.hexdigest()
+    return calculate_file_digest(file_path, "sha256").hexdigest()
+
+def load_yaml(stream):
+    """
+    Parses YAML with the safe loader, using the libyaml-backed one when PyYAML has it.
+
+    Pass the whole document as bytes or str where possible: libyaml then parses it
+    in one go instead of calling back into Python to read a file object.
+    """
+    import yaml
+    return yaml.load(stream, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+def dump_yaml(data, stream=None, **kwargs):
+    """Serializes data as YAML with the safe dumper, using the libyaml-backed one when PyYAML has it."""
+    import yaml
+    return yaml.dump(data, stream, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper), **kwargs)
+
+def read_json(file_path: Path):
+    """Reads and parses a JSON file, using orjson when it is available."""
+    data = Path(file_path).read_bytes()
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def write_json(file_path: Path, data) -> None:
+    """
+    Serializes data as indented JSON and writes it to a file in a single write.
+
+    The content goes to a temporary file next to the target which is then renamed
+    over it, so readers never see a partially written file.
+    """
+    if orjson:
+        content = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        content = json.dumps(data, indent=2).encode('utf-8')
+    file_path = Path(file_path)
+    tmp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+# Members larger than this are inflated by zipfile in chunks rather than in one buffer
+MAX_WHOLE_BUFFER_INFLATE_SIZE = 256 << 20
+
+_ZIP_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+
+def _read_raw_zip_member(archive_file, info: zipfile.ZipInfo) -> bytes:
+    """Reads the still-compressed data of a zip member, skipping its local file header."""
+    archive_file.seek(_zip_member_data_offset(archive_file, info))
+    return archive_file.read(info.compress_size)
+
+def _member_destination(destination: Path, member_name: str) -> Path:
+    """Maps a member name to a path below destination, dropping absolute and '..' parts like zipfile does."""
+    parts = [part for part in member_name.replace("\\", "/").split("/") if part not in ("", ".", "..")]
+    return destination.joinpath(*parts)
+
+@contextlib.contextmanager
+def _open_binary(file):
+    """Opens a path for binary reading, or passes an already open file object through."""
+    if hasattr(file, "read"):
+        yield file
+    else:
+        with open(file, 'rb') as f:
+            yield f
+
+class _FileRange(io.RawIOBase):
+    """A read-only, seekable view of length bytes of an open file, starting at start."""
+
+    def __init__(self, file, start: int, length: int):
+        super().__init__()
+        self._file = file
+        self._start = start
+        self._length = length
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self._length
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self._position = offset
+        return offset
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), self._length - self._position)
+        if size <= 0:
+            return 0
+        self._file.seek(self._start + self._position)
+        read = self._file.readinto(memoryview(buffer)[:size])
+        self._position += read
+        return read
+
+@contextlib.contextmanager
+def open_zip_member_seekable(archive: zipfile.ZipFile, name: str):
+    """
+    Opens a zip member as a seekable binary file, e.g. to read a zip stored inside a zip.
+
+    A stored (uncompressed) member of an archive opened from a path is read in place
+    through a view of the archive file, so it is never copied into memory. Other
+    members are inflated into memory.
+    """
+    info = archive.getinfo(name)
+    if info.compress_type != zipfile.ZIP_STORED or info.flag_bits & 0x1 or not archive.filename:
+        yield io.BytesIO(archive.read(info))
+        return
+
+    with open(archive.filename, 'rb') as archive_file:
+        yield _FileRange(archive_file, _zip_member_data_offset(archive_file, info), info.compress_size)
+
+def _inflate_zip_member(raw_data: bytes, info: zipfile.ZipInfo, target_path: Path) -> None:
+    """Inflates a deflated member with libdeflate in one call, checks its CRC-32 and writes it out."""
+    content = deflate.deflate_decompress(raw_data, info.file_size)
+    if zlib.crc32(content) != info.CRC:
+        raise zipfile.BadZipFile(f"Bad CRC-32 for file {info.filename!r}")
+    with open(target_path, 'wb') as f:
+        f.write(content)
+
+def extract_zip(zip_path, destination: Path) -> None:
+    """
+    Extracts a zip archive (a path or a seekable binary file object), like ZipFile.extractall.
+
+    When the optional deflate package is installed, deflated members are inflated
+    with libdeflate in a single call instead of through zlib's streaming API, and
+    checked against their stored CRC-32. Other members (stored, encrypted or very
+    large ones) are extracted by zipfile as usual.
+
+    Archives given by path are extracted by a thread pool: compressed data is read
+    in order, while members are inflated and written side by side.
+    """
+    destination = Path(destination)
+    # A file object can't be read from several threads, each needing its own position
+    workers = 1 if hasattr(zip_path, "read") else min(8, os.cpu_count() or 1)
+    with zipfile.ZipFile(zip_path, 'r') as archive:
+        if deflate is None and workers == 1:
+            archive.extractall(destination)
+            return
+
+        infos = archive.infolist()
+        # Directories are all created up front, so that members never race to create them
+        for directory in {_member_destination(destination, info.filename) if info.is_dir()
+                          else _member_destination(destination, info.filename).parent for info in infos}:
+            directory.mkdir(parents=True, exist_ok=True)
+
+        def extract_member(info, archive_file):
+            """Returns a function writing the member out, reading its compressed data right away."""
+            if (deflate is None or info.compress_type != zipfile.ZIP_DEFLATED
+                    or info.flag_bits & 0x1 or info.file_size > MAX_WHOLE_BUFFER_INFLATE_SIZE):
+                return lambda: archive.extract(info, destination)
+            raw_data = _read_raw_zip_member(archive_file, info)
+            return lambda: _inflate_zip_member(raw_data, info, _member_destination(destination, info.filename))
+
+        with _open_binary(zip_path) as archive_file:
+            file_infos = (info for info in infos if not info.is_dir())
+            if workers == 1:
+                for info in file_infos:
+                    extract_member(info, archive_file)()
+                return
+
+            # zipfile serializes reads of its own file handle, and inflating releases the GIL
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                pending = collections.deque()
+                for info in file_infos:
+                    if info.file_size > PARALLEL_ZIP_MAX_FILE_SIZE:
+                        # Large members are written on their own, so that at most one is held in memory
+                        while pending:
+                            pending.popleft().result()
+                        extract_member(info, archive_file)()
+                        continue
+
+                    pending.append(executor.submit(extract_member(info, archive_file)))
+                    if len(pending) >= PARALLEL_ZIP_WINDOW:
+                        pending.popleft().result()
+                while pending:
+                    pending.popleft().result()
+
+def _append_raw_zip_member(target_zip: zipfile.ZipFile, info: zipfile.ZipInfo, write_data) -> None:
+    """
+    Appends a member whose sizes, CRC and (compressed) data are already known.
+
+    zipfile has no public API for raw writes, so this writes the local header itself,
+    calls write_data(file) to write the data right after it, and registers the entry
+    the same way ZipFile.write does. That takes ZipFile internals (_lock, _writing,
+    _writecheck, _seekable, start_dir, _didModify and zipfile._strip_extra), which
+    are the same in CPython 3.10 through 3.13.
+    """
+    with target_zip._lock:
+        if target_zip._writing:
+            raise ValueError("Can't write to ZIP archive while an open writing handle exists")
+        target_zip._writecheck(info)
+        # The sizes and CRC are known up front, so no data descriptor follows the data
+        info.flag_bits &= ~0x08
+        info.extra = zipfile._strip_extra(info.extra, (1,))  # zip64 sizes are re-added as needed
+        if target_zip._seekable:
+            target_zip.fp.seek(target_zip.start_dir)
+        info.header_offset = target_zip.fp.tell()
+        target_zip.fp.write(info.FileHeader())
+        write_data(target_zip.fp)
+
+        target_zip.start_dir = target_zip.fp.tell()
+        target_zip.filelist.append(info)
+        target_zip.NameToInfo[info.filename] = info
+        target_zip._didModify = True
+
+def _zip_member_data_offset(archive_file, info: zipfile.ZipInfo) -> int:
+    """Returns where the (compressed) data of a zip member starts, after its local header."""
+    archive_file.seek(info.header_offset)
+    header = _ZIP_LOCAL_HEADER.unpack(archive_file.read(_ZIP_LOCAL_HEADER.size))
+    if header[0] != b"PK\x03\x04":
+        raise zipfile.BadZipFile(f"Bad local file header for {info.filename}")
+    return info.header_offset + _ZIP_LOCAL_HEADER.size + header[9] + header[10]
+
+def _copy_file_range(source_file, target_file, source_offset: int, length: int) -> int:
+    """
+    Copies up to length bytes at source_offset to the current position of target_file
+    in the kernel with copy_file_range(2), which reflinks on CoW filesystems such as
+    btrfs and XFS. Returns how many bytes were copied, which is 0 where the call is
+    unavailable or unsupported for these files.
+    """
+    if not hasattr(os, "copy_file_range"):
+        return 0
+    try:
+        source_fd, target_fd = source_file.fileno(), target_file.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return 0
+
+    target_file.flush()
+    target_offset = target_file.tell()
+    copied = 0
+    while copied < length:
+        try:
+            count = os.copy_file_range(source_fd, target_fd, length - copied,
+                                       source_offset + copied, target_offset + copied)
+        except OSError:
+            # e.g. EXDEV across filesystems on older kernels, or EINVAL on filesystems
+            # without support; the caller copies the rest through user space
+            break
+        if not count:
+            break
+        copied += count
+    # Explicit offsets leave the file position alone
+    target_file.seek(target_offset + copied)
+    return copied
+
+def _copy_raw_zip_data(source_path, info: zipfile.ZipInfo, target_file) -> None:
+    """Copies the still-compressed data of a zip member to target_file."""
+    with _open_binary(source_path) as source_file:
+        data_start = _zip_member_data_offset(source_file, info)
+        copied = _copy_file_range(source_file, target_file, data_start, info.compress_size)
+        remaining = info.compress_size - copied
+        source_file.seek(data_start + copied)
+        while remaining:
+            block = source_file.read(min(remaining, HASH_CHUNK_SIZE))
+            if not block:
+                raise zipfile.BadZipFile(f"Truncated data for {info.filename}")
+            target_file.write(block)
+            remaining -= len(block)
+
+def copy_zip_member(source_zip: zipfile.ZipFile, target_zip: zipfile.ZipFile, name: str) -> None:
+    """
+    Copies a member from one open zip archive to another as is, without inflating
+    and deflating it again. source_zip must have been opened from a path.
+    """
+    source_info = source_zip.getinfo(name)
+    _append_raw_zip_member(target_zip, copy.copy(source_info),
+                           lambda target_file: _copy_raw_zip_data(source_zip.filename, source_info, target_file))
+
+# Files up to this size are compressed (add_files_to_zip) or inflated (extract_zip) whole by worker threads
+PARALLEL_ZIP_MAX_FILE_SIZE = 4 << 20
+
+# Files add_files_to_zip and extract_zip keep in flight at once, which bounds the memory they hold
+PARALLEL_ZIP_WINDOW = 64
+
+def _compress_file_for_zip(target_zip: zipfile.ZipFile, file_path: Path, arcname: str, compress_type):
+    """Reads and compresses a small file the way ZipFile.write would, returning (ZipInfo, data)."""
+    info = zipfile.ZipInfo.from_file(file_path, arcname, strict_timestamps=target_zip._strict_timestamps)
+    info.compress_type = target_zip.compression if compress_type is None else compress_type
+    data = Path(file_path).read_bytes()
+    info.file_size = len(data)
+    info.CRC = zlib.crc32(data)
+    if info.compress_type == zipfile.ZIP_DEFLATED:
+        # zlib releases the GIL while compressing, so worker threads run side by side
+        level = target_zip.compresslevel if target_zip.compresslevel is not None else zlib.Z_DEFAULT_COMPRESSION
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        data = compressor.compress(data) + compressor.flush()
+    info.compress_size = len(data)
+    return info, data
+
+def add_files_to_zip(target_zip: zipfile.ZipFile, files) -> None:
+    """
+    Adds many files to an open zip archive, in order, like calling ZipFile.write for each.
+
+    files yields (path, arcname, compress_type) tuples, where a compress_type of None
+    means the archive's default. Small stored or deflated files are read and
+    compressed by a thread pool while earlier ones are written; large files and
+    other compression methods go through ZipFile.write.
+    """
+    workers = min(8, os.cpu_count() or 1)
+    if workers == 1:
+        # Nothing to overlap with; handing files to a thread would only add overhead
+        for file_path, arcname, compress_type in files:
+            target_zip.write(file_path, arcname, compress_type=compress_type)
+        return
+
+    def write_ready(pending) -> None:
+        info, data = pending.popleft().result()
+        _append_raw_zip_member(target_zip, info, lambda target_file: target_file.write(data))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = collections.deque()
+        for file_path, arcname, compress_type in files:
+            method = target_zip.compression if compress_type is None else compress_type
+            if (method not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+                    or os.stat(file_path).st_size > PARALLEL_ZIP_MAX_FILE_SIZE):
+                while pending:
+                    write_ready(pending)
+                target_zip.write(file_path, arcname, compress_type=compress_type)
+                continue
+
+            pending.append(executor.submit(_compress_file_for_zip, target_zip, file_path, arcname, compress_type))
+            if len(pending) >= PARALLEL_ZIP_WINDOW:
+                write_ready(pending)
+        while pending:
+            write_ready(pending)
@@ -0,0 +1,102 @@
+import os
+import zipfile
+
+import pytest
+
+from fourdst.core.build import _sync_sdist_sources
+
+# An mtime well before the test runs, so any rewrite of a file shows up
+OLD_MTIME = 1_000_000_000
+
+
+def _write_sdist(path, files):
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as sdist_zip:
+        for name, content in files.items():
+            sdist_zip.writestr(name, content)
+    return path
+
+
+def _age(root):
+    """Sets the mtime of every file below root to OLD_MTIME."""
+    for path in root.rglob("*"):
+        if path.is_file():
+            os.utime(path, (OLD_MTIME, OLD_MTIME))
+
+
+def _mtimes(root):
+    return {path.relative_to(root).as_posix(): path.stat().st_mtime
+            for path in root.rglob("*") if path.is_file()}
+
+
+@pytest.fixture
+def synced(tmp_path):
+    """Syncs a first sdist into a fresh source directory and returns a function that syncs another."""
+    source_dir = tmp_path / "build" / "src"
+    state_file = tmp_path / "build" / ".sdist_state.json"
+    source_dir.parent.mkdir()
+    messages = []
+
+    def sync(files):
+        sdist_path = _write_sdist(tmp_path / f"sdist{len(messages)}.zip", files)
+        messages.clear()
+        _sync_sdist_sources(sdist_path, source_dir, state_file, messages.append)
+        return messages
+
+    sync({
+        "meson.build": "project('demo', 'cpp')\n",
+        "src/demo.cpp": "int demo() { return 1; }\n",
+        "src/old.cpp": "int old() { return 0; }\n",
+    })
+    # Outputs of earlier native (build/) and Docker (meson_build/) builds
+    (source_dir / "build").mkdir()
+    (source_dir / "build" / "build.ninja").write_text("ninja\n")
+    (source_dir / "meson_build").mkdir()
+    (source_dir / "meson_build" / "libdemo.so").write_bytes(b"\x7fELF")
+    _age(source_dir)
+    return source_dir, sync
+
+
+def test_unchanged_sdist_is_not_touched(synced):
+    source_dir, sync = synced
+    before = _mtimes(source_dir)
+
+    messages = sync({
+        "meson.build": "project('demo', 'cpp')\n",
+        "src/demo.cpp": "int demo() { return 1; }\n",
+        "src/old.cpp": "int old() { return 0; }\n",
+    })
+
+    assert messages == ["Sources unchanged, reusing previous build..."]
+    assert _mtimes(source_dir) == before
+
+
+def test_changed_member_is_rewritten_and_others_keep_their_mtime(synced):
+    source_dir, sync = synced
+
+    sync({
+        "meson.build": "project('demo', 'cpp')\n",
+        "src/demo.cpp": "int demo() { return 2; }\n",
+        "src/old.cpp": "int old() { return 0; }\n",
+    })
+
+    assert (source_dir / "src" / "demo.cpp").read_text() == "int demo() { return 2; }\n"
+    mtimes = _mtimes(source_dir)
+    assert mtimes.pop("src/demo.cpp") != OLD_MTIME
+    assert set(mtimes.values()) == {OLD_MTIME}
+
+
+def test_removed_member_is_deleted_and_build_outputs_survive(synced):
+    source_dir, sync = synced
+
+    sync({
+        "meson.build": "project('demo', 'cpp')\n",
+        "src/demo.cpp": "int demo() { return 1; }\n",
+    })
+
+    assert not (source_dir / "src" / "old.cpp").exists()
+    assert _mtimes(source_dir) == {
+        "meson.build": OLD_MTIME,
+        "src/demo.cpp": OLD_MTIME,
+        "build/build.ninja": OLD_MTIME,
+        "meson_build/libdemo.so": OLD_MTIME,
+    }
@@ -0,0 +1,107 @@
+import zipfile
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+from fourdst.core import bundle
+from fourdst.core.utils import dump_yaml, load_yaml
+
+TARGET = {'triplet': 'x86_64-linux', 'abi_signature': 'gcc-libstdc++-abi1', 'type': 'native'}
+
+
+@pytest.fixture
+def bundle_path(tmp_path):
+    """An unsigned, unfilled bundle with the manifest first, as create_bundle writes it."""
+    path = tmp_path / "demo.fbundle"
+    manifest = {
+        'bundleName': 'demo',
+        'bundleVersion': '0.1.0',
+        'bundlePlugins': {'demo': {'sdist': {'path': 'demo/demo_src.zip'}, 'binaries': []}},
+    }
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as bundle_zip:
+        bundle_zip.writestr("manifest.yaml", dump_yaml(manifest, sort_keys=False))
+        bundle_zip.writestr("demo/demo_src.zip", b"sdist " * 1000)
+    return path
+
+
+@pytest.fixture
+def private_key(tmp_path):
+    key = ed25519.Ed25519PrivateKey.generate()
+    path = tmp_path / "author.pem"
+    path.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ))
+    return path, key.public_key()
+
+
+@pytest.fixture
+def fake_build(tmp_path, monkeypatch):
+    """Replaces the native build of fill_bundle with one that returns a fixed library."""
+    library = tmp_path / "libdemo.so"
+    library.write_bytes(b"\x7fELF" + bytes(range(256)) * 64)
+    monkeypatch.setattr(bundle, "get_target_build_dir", lambda plugin_name, target: tmp_path / "build" / plugin_name)
+    monkeypatch.setattr(bundle, "build_plugin_for_target",
+                        lambda sdist_path, build_dir, target, progress_callback=None: (library, dict(target)))
+    return library
+
+
+def _assert_intact(bundle_path):
+    with zipfile.ZipFile(bundle_path) as bundle_zip:
+        assert bundle_zip.testzip() is None
+    result = bundle.validate_bundle(bundle_path)
+    assert result['success'], result['errors']
+    return result
+
+
+def _assert_signed_by(bundle_path, public_key):
+    with zipfile.ZipFile(bundle_path) as bundle_zip:
+        manifest = load_yaml(bundle_zip.read("manifest.yaml"))
+        signed_data = bundle._create_canonical_checksum_list(bundle_zip, manifest).encode('utf-8')
+    # Raises InvalidSignature if the signature does not match the content
+    public_key.verify(bytes.fromhex(manifest['bundleSignature']['signature']), signed_data)
+    return manifest
+
+
+def test_sign_resign_and_fill_keep_the_bundle_valid(bundle_path, private_key, fake_build):
+    key_path, public_key = private_key
+
+    # The first signature moves the manifest to the end, where later rewrites replace it in place
+    bundle.sign_bundle(bundle_path, key_path)
+    _assert_intact(bundle_path)
+    _assert_signed_by(bundle_path, public_key)
+    with zipfile.ZipFile(bundle_path) as bundle_zip:
+        assert bundle_zip.namelist()[-1] == "manifest.yaml"
+
+    bundle.sign_bundle(bundle_path, key_path)
+    _assert_intact(bundle_path)
+    _assert_signed_by(bundle_path, public_key)
+
+    result = bundle.fill_bundle(bundle_path, {'demo': [TARGET]})
+    assert result['success'] and result['build_results']['successful'] == 1
+    _assert_intact(bundle_path)
+
+    bundle.sign_bundle(bundle_path, key_path)
+    _assert_intact(bundle_path)
+    manifest = _assert_signed_by(bundle_path, public_key)
+    [binary] = manifest['bundlePlugins']['demo']['binaries']
+    with zipfile.ZipFile(bundle_path) as bundle_zip:
+        assert bundle_zip.read(binary['path']) == fake_build.read_bytes()
+        assert bundle_zip.namelist().count("manifest.yaml") == 1
+
+
+def test_failed_in_place_rewrite_leaves_bundle_unchanged(bundle_path, private_key, monkeypatch):
+    key_path, _ = private_key
+    bundle.sign_bundle(bundle_path, key_path)
+    original = bundle_path.read_bytes()
+
+    def fail_after_partial_write(bundle_zip, arcname, content):
+        bundle_zip.fp.write(b"partial member")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(bundle, "_write_bundle_member", fail_after_partial_write)
+    with pytest.raises(OSError):
+        bundle._rewrite_bundle(bundle_path, {"manifest.yaml": b"bundleName: other\n"})
+
+    assert bundle_path.read_bytes() == original
+    _assert_intact(bundle_path)
@@ -0,0 +1,48 @@
+import pytest
+
+from fourdst.core import keys
+
+
+@pytest.fixture
+def trust_store(tmp_path, monkeypatch):
+    """An empty trust store with its own fingerprint index."""
+    store = tmp_path / "keys"
+    store.mkdir()
+    monkeypatch.setattr(keys, "LOCAL_TRUST_STORE_PATH", store)
+    monkeypatch.setattr(keys, "KEY_FINGERPRINT_INDEX", tmp_path / "key_fingerprints.json")
+    monkeypatch.setattr(keys, "_fingerprint_index", {})
+    return store
+
+
+def _add_key(store, source, name, content=b"ssh-ed25519 AAAA test\n"):
+    (store / source).mkdir(exist_ok=True)
+    key_path = store / source / name
+    key_path.write_bytes(content)
+    return key_path
+
+
+@pytest.mark.parametrize("requested_source", ["aaa", "zzz"])
+def test_remove_by_trust_store_path_removes_only_that_file(trust_store, requested_source):
+    copies = {source: _add_key(trust_store, source, "dev.pub") for source in ("aaa", "zzz")}
+
+    result = keys.remove_key(str(copies[requested_source]))
+
+    assert result["success"]
+    assert [removed["path"] for removed in result["removed_keys"]] == [str(copies[requested_source])]
+    assert not copies[requested_source].exists()
+    assert all(path.exists() for source, path in copies.items() if source != requested_source)
+
+
+def test_remove_by_outside_path_matches_content(trust_store, tmp_path):
+    copies = [_add_key(trust_store, source, "dev.pub") for source in ("aaa", "zzz")]
+    outside_key = tmp_path / "dev.pub"
+    outside_key.write_bytes(copies[0].read_bytes())
+
+    result = keys.remove_key(str(outside_key))
+    assert result["removed_count"] == 1
+    assert sum(path.exists() for path in copies) == 1
+    assert outside_key.exists()
+
+    result = keys.remove_key(str(outside_key), remove_all=True)
+    assert result["removed_count"] == 1
+    assert not any(path.exists() for path in copies)
@@ -0,0 +1,85 @@
+import re
+import difflib
+import random
+
+from fourdst.core.plugin import _unified_diff
+
+HUNK_HEADER = re.compile(r'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@$')
+
+
+def _edit(rnd, lines, new_line):
+    """Returns a copy of lines with a few random insertions, deletions and replacements."""
+    edited = list(lines)
+    for _ in range(rnd.randint(0, 4)):
+        position = rnd.randint(0, len(edited))
+        operation = rnd.random()
+        if operation < 0.4 or not edited:
+            edited.insert(position, new_line())
+        elif operation < 0.7:
+            del edited[min(position, len(edited) - 1)]
+        else:
+            edited[min(position, len(edited) - 1)] = new_line()
+    return edited
+
+
+def _hunks(diff_lines):
+    """Splits a unified diff into (a_start, a_length, body) tuples, with 0-based starts."""
+    hunks = []
+    for line in diff_lines[2:]:
+        match = HUNK_HEADER.match(line.rstrip('\n'))
+        if match:
+            a_length = 1 if match[2] is None else int(match[2])
+            a_start = int(match[1]) - 1 if a_length else int(match[1])
+            hunks.append((a_start, a_length, []))
+        else:
+            hunks[-1][2].append(line)
+    return hunks
+
+
+def _apply(lines_a, diff_lines):
+    """Applies a unified diff to lines_a, checking every context and removed line on the way."""
+    result = []
+    position = 0
+    for a_start, _, body in _hunks(diff_lines):
+        result.extend(lines_a[position:a_start])
+        position = a_start
+        for line in body:
+            if line[0] in ' -':
+                assert lines_a[position] == line[1:]
+                position += 1
+            if line[0] in ' +':
+                result.append(line[1:])
+    result.extend(lines_a[position:])
+    return result
+
+
+def test_matches_difflib_for_unique_lines():
+    rnd = random.Random(0)
+    counter = iter(range(10 ** 9))
+    new_line = lambda: f"line {next(counter)}\n"
+    for _ in range(3000):
+        lines_a = [new_line() for _ in range(rnd.randint(0, 40))]
+        lines_b = _edit(rnd, lines_a, new_line)
+        n = rnd.randint(0, 4)
+        assert list(_unified_diff(lines_a, lines_b, 'a/f', 'b/f', n=n)) == \
+            list(difflib.unified_diff(lines_a, lines_b, 'a/f', 'b/f', n=n))
+
+
+def test_repeated_lines_keep_full_context():
+    rnd = random.Random(1)
+    for _ in range(3000):
+        alphabet_size = rnd.randint(1, 6)
+        new_line = lambda: f"l{rnd.randint(0, alphabet_size)}\n"
+        lines_a = [new_line() for _ in range(rnd.randint(0, 30))]
+        lines_b = _edit(rnd, lines_a, new_line)
+        n = rnd.randint(0, 4)
+        diff_lines = list(_unified_diff(lines_a, lines_b, 'a/f', 'b/f', n=n))
+
+        assert bool(diff_lines) == (lines_a != lines_b)
+        assert _apply(lines_a, diff_lines) == lines_b
+        for a_start, a_length, body in _hunks(diff_lines):
+            changed = [i for i, line in enumerate(body) if line[0] != ' ']
+            leading, trailing = changed[0], len(body) - 1 - changed[-1]
+            # Context is only cut short at the start and end of the file
+            assert leading == n or a_start == 0
+            assert trailing == n or a_start + a_length == len(lines_a)